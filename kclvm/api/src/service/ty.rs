@@ -1,28 +1,28 @@
 use crate::gpyrpc::{Decorator, Example, KclType};
 use indexmap::IndexSet;
-use kclvm_sema::ty::{DictType, SchemaType, Type};
+use kclvm_sema::ty::{DictType, SchemaType, Type, TypeKind};
 use std::collections::HashMap;
 
 /// Convert the kcl sematic type to the kcl protobuf type.
 pub(crate) fn kcl_ty_to_pb_ty(ty: &Type) -> KclType {
     match &ty.kind {
-        kclvm_sema::ty::TypeKind::List(item_ty) => KclType {
+        TypeKind::List(item_ty) => KclType {
             r#type: "list".to_string(),
             item: Some(Box::new(kcl_ty_to_pb_ty(item_ty))),
             ..Default::default()
         },
-        kclvm_sema::ty::TypeKind::Dict(DictType { key_ty, val_ty, .. }) => KclType {
+        TypeKind::Dict(DictType { key_ty, val_ty, .. }) => KclType {
             r#type: "dict".to_string(),
             key: Some(Box::new(kcl_ty_to_pb_ty(key_ty))),
             item: Some(Box::new(kcl_ty_to_pb_ty(val_ty))),
             ..Default::default()
         },
-        kclvm_sema::ty::TypeKind::Union(types) => KclType {
+        TypeKind::Union(types) => KclType {
             r#type: "union".to_string(),
             union_types: types.iter().map(|ty| kcl_ty_to_pb_ty(ty)).collect(),
             ..Default::default()
         },
-        kclvm_sema::ty::TypeKind::Schema(schema_ty) => kcl_schema_ty_to_pb_ty(schema_ty),
+        TypeKind::Schema(schema_ty) => kcl_schema_ty_to_pb_ty(schema_ty),
         _ => KclType {
             r#type: ty.ty_str(),
             ..Default::default()
@@ -39,15 +39,7 @@ pub(crate) fn kcl_schema_ty_to_pb_ty(schema_ty: &SchemaType) -> KclType {
         examples: get_schema_ty_examples(schema_ty),
         properties: get_schema_ty_attributes(schema_ty, &mut 1),
         required: get_schema_ty_required_attributes(schema_ty),
-        decorators: schema_ty
-            .decorators
-            .iter()
-            .map(|d| Decorator {
-                name: d.name.clone(),
-                arguments: d.arguments.clone(),
-                keywords: d.keywords.clone(),
-            })
-            .collect(),
+        decorators: kcl_decorators_to_pb_decorators(&schema_ty.decorators),
         filename: schema_ty.filename.clone(),
         pkg_path: schema_ty.pkgpath.clone(),
         description: schema_ty.doc.clone(),
@@ -59,6 +51,22 @@ pub(crate) fn kcl_schema_ty_to_pb_ty(schema_ty: &SchemaType) -> KclType {
     }
 }
 
+/// Convert the kcl sematic decorators to the kcl protobuf decorators.
+fn kcl_decorators_to_pb_decorators(decorators: &[kclvm_sema::ty::Decorator]) -> Vec<Decorator> {
+    // Most schemas and attributes have no decorators, skip the iterator setup for them.
+    if decorators.is_empty() {
+        return Vec::new();
+    }
+    decorators
+        .iter()
+        .map(|d| Decorator {
+            name: d.name.clone(),
+            arguments: d.arguments.clone(),
+            keywords: d.keywords.clone(),
+        })
+        .collect()
+}
+
 fn get_schema_ty_examples(schema_ty: &SchemaType) -> HashMap<String, Example> {
     let mut examples = HashMap::new();
     for (key, example) in &schema_ty.examples {
@@ -73,49 +81,46 @@ fn get_schema_ty_examples(schema_ty: &SchemaType) -> HashMap<String, Example> {
 }
 
 fn get_schema_ty_attributes(schema_ty: &SchemaType, line: &mut i32) -> HashMap<String, KclType> {
-    let mut base_type_mapping = if let Some(base) = &schema_ty.base {
-        get_schema_ty_attributes(base, line)
-    } else {
-        HashMap::new()
-    };
-    let mut type_mapping = HashMap::new();
-    for (key, attr) in &schema_ty.attrs {
-        let mut ty = kcl_ty_to_pb_ty(&attr.ty);
-        ty.line = *line;
-        ty.description = attr.doc.clone().unwrap_or_default();
-        ty.decorators = attr
-            .decorators
-            .iter()
-            .map(|d| Decorator {
-                name: d.name.clone(),
-                arguments: d.arguments.clone(),
-                keywords: d.keywords.clone(),
-            })
-            .collect();
-        ty.default = attr.default.clone().unwrap_or_default();
-        type_mapping.insert(key.to_string(), ty);
-        *line += 1
+    // Walk the schema inheritance chain with an explicit stack from the root base schema
+    // to the schema itself, so deep inheritance chains do not recurse.
+    let mut schema_chain = vec![schema_ty];
+    let mut base = schema_ty.base.as_deref();
+    while let Some(base_ty) = base {
+        schema_chain.push(base_ty);
+        base = base_ty.base.as_deref();
     }
-    for (k, ty) in type_mapping {
-        base_type_mapping.insert(k, ty);
+    // Attributes of the schema override the base schema attributes with the same name,
+    // so insert them into the base mapping directly instead of merging two maps.
+    let mut type_mapping = HashMap::new();
+    while let Some(schema_ty) = schema_chain.pop() {
+        type_mapping.reserve(schema_ty.attrs.len());
+        for (key, attr) in &schema_ty.attrs {
+            let ty = KclType {
+                line: *line,
+                description: attr.doc.clone().unwrap_or_default(),
+                decorators: kcl_decorators_to_pb_decorators(&attr.decorators),
+                default: attr.default.clone().unwrap_or_default(),
+                ..kcl_ty_to_pb_ty(&attr.ty)
+            };
+            type_mapping.insert(key.to_string(), ty);
+            *line += 1
+        }
     }
-    base_type_mapping
+    type_mapping
 }
 
 fn get_schema_ty_required_attributes(schema_ty: &SchemaType) -> Vec<String> {
-    let base_attr_set = if let Some(base) = &schema_ty.base {
-        get_schema_ty_required_attributes(base)
-    } else {
-        Vec::new()
-    };
-    let mut attr_set = IndexSet::new();
-    for (key, attr) in &schema_ty.attrs {
-        if !attr.is_optional {
-            attr_set.insert(key.to_string());
+    // Collect required attributes from the schema to its root base schema into one
+    // ordered set, the schema attributes come first followed by the base ones.
+    let mut attr_set: IndexSet<String> = IndexSet::new();
+    let mut current = Some(schema_ty);
+    while let Some(schema_ty) = current {
+        for (key, attr) in &schema_ty.attrs {
+            if !attr.is_optional && !attr_set.contains(key.as_str()) {
+                attr_set.insert(key.to_string());
+            }
         }
+        current = schema_ty.base.as_deref();
     }
-    for k in base_attr_set {
-        attr_set.insert(k);
-    }
-    attr_set.iter().cloned().collect()
+    attr_set.into_iter().collect()
 }
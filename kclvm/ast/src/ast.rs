@@ -247,7 +247,7 @@ impl<T> Node<T> {
     }
 
     pub fn set_pos(&mut self, pos: PosTuple) {
-        self.filename = pos.0.clone();
+        self.filename = pos.0;
         self.line = pos.1;
         self.column = pos.2;
         self.end_line = pos.3;
@@ -800,7 +800,12 @@ pub struct Identifier {
 
 impl Identifier {
     pub fn get_name(&self) -> String {
-        self.get_names().join(".")
+        // Join the borrowed names, without cloning each name into a temporary list first.
+        self.names
+            .iter()
+            .map(|node| node.node.as_str())
+            .collect::<Vec<&str>>()
+            .join(".")
     }
 
     pub fn get_names(&self) -> Vec<String> {
@@ -909,16 +914,21 @@ pub enum QuantOperation {
     Map,
 }
 
-impl From<QuantOperation> for String {
-    fn from(val: QuantOperation) -> Self {
-        let s = match val {
+impl QuantOperation {
+    /// Returns the symbol
+    pub fn symbol(&self) -> &'static str {
+        match self {
             QuantOperation::All => "all",
             QuantOperation::Any => "any",
             QuantOperation::Filter => "filter",
             QuantOperation::Map => "map",
-        };
+        }
+    }
+}
 
-        s.to_string()
+impl From<QuantOperation> for String {
+    fn from(val: QuantOperation) -> Self {
+        val.symbol().to_string()
     }
 }
 
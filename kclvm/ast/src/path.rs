@@ -59,21 +59,32 @@ pub fn get_key_path(key: &Option<ast::NodeRef<ast::Expr>>) -> String {
 /// ```
 pub fn get_attr_paths_from_config_expr(config: &ast::ConfigExpr) -> Vec<String> {
     let mut paths = vec![];
+    let mut prefix = String::new();
+    collect_attr_paths(config, &mut prefix, &mut paths);
+    paths
+}
+
+/// Collect all attribute paths of the config entries into `paths`. The parent path
+/// is kept in the shared `prefix` buffer, so each path is built only once instead
+/// of being re-concatenated at every nesting level.
+fn collect_attr_paths(config: &ast::ConfigExpr, prefix: &mut String, paths: &mut Vec<String>) {
     for entry in &config.items {
-        let mut entry_paths = get_entry_paths(&entry.node);
-        paths.append(&mut entry_paths);
+        collect_entry_paths(&entry.node, prefix, paths);
     }
-    paths
 }
 
-/// Get all attribute paths from a config entry.
-fn get_entry_paths(entry: &ast::ConfigEntry) -> Vec<String> {
-    let mut paths = vec![];
+/// Collect all attribute paths from a config entry.
+fn collect_entry_paths(entry: &ast::ConfigEntry, prefix: &mut String, paths: &mut Vec<String>) {
     let path = get_key_path(&entry.key);
     if path.is_empty() || path.trim().is_empty() {
-        return paths;
+        return;
+    }
+    let prefix_len = prefix.len();
+    if prefix_len > 0 {
+        prefix.push('.');
     }
-    paths.push(path.clone());
+    prefix.push_str(&path);
+    paths.push(prefix.clone());
     let option_config_expr = match &entry.value.node {
         ast::Expr::Schema(schema_expr) => {
             if let ast::Expr::Config(config_expr) = &schema_expr.config.node {
@@ -86,15 +97,7 @@ fn get_entry_paths(entry: &ast::ConfigEntry) -> Vec<String> {
         _ => None,
     };
     if let Some(config_expr) = option_config_expr {
-        let value_paths = get_attr_paths_from_config_expr(config_expr);
-        if !value_paths.is_empty() {
-            paths.append(
-                &mut value_paths
-                    .iter()
-                    .map(|value_path| format!("{}.{}", path, value_path))
-                    .collect::<Vec<String>>(),
-            );
-        }
+        collect_attr_paths(config_expr, prefix, paths);
     }
-    paths
+    prefix.truncate(prefix_len);
 }
@@ -5,6 +5,7 @@ use kclvm_ast::{
     walker::MutSelfTypedResultWalker,
 };
 use std::collections::VecDeque;
+use std::fmt::Write;
 mod node;
 
 #[cfg(test)]
@@ -25,7 +26,7 @@ pub enum Indentation {
 }
 
 /// Printer config
-#[derive(Debug)]
+#[derive(Debug, Clone, Copy)]
 pub struct Config {
     pub tab_len: usize,
     pub indent_len: usize,
@@ -112,8 +113,7 @@ impl<'p> Printer<'p> {
     #[inline]
     pub fn writeln(&mut self, text: &str) {
         self.write_string(text);
-        self.write_string(NEWLINE);
-        self.fill("");
+        self.write_newline_with_indent();
     }
 
     /// Write a space.
@@ -124,23 +124,50 @@ impl<'p> Printer<'p> {
 
     /// Fill a indent
     pub fn fill(&mut self, text: &str) {
+        self.write_indent();
+        if !text.is_empty() {
+            self.write(text);
+        }
+    }
+
+    /// Returns the indent character and its count of the current indent level.
+    #[inline]
+    fn indent_chars(&self) -> (char, usize) {
         if self.cfg.use_spaces {
-            self.write(&format!(
-                "{}{}",
-                WHITESPACE.repeat(self.indent * self.cfg.indent_len),
-                text
-            ));
+            (' ', self.indent * self.cfg.indent_len)
         } else {
-            self.write(&format!("{}{}", TAB.repeat(self.indent), text));
+            ('\t', self.indent)
         }
     }
 
+    /// Write the indent characters of the current indent level.
+    #[inline]
+    fn write_indent(&mut self) {
+        // Push the indent characters into the output buffer directly, the repeated
+        // indent string and its formatted copy are not allocated on every fill.
+        let (ch, count) = self.indent_chars();
+        self.out.extend(std::iter::repeat(ch).take(count));
+    }
+
+    /// Write a newline followed by the indent of the current level, the buffer
+    /// is grown once for both of them.
+    #[inline]
+    fn write_newline_with_indent(&mut self) {
+        let (ch, count) = self.indent_chars();
+        self.out.reserve(NEWLINE.len() + count);
+        self.write_string(NEWLINE);
+        self.out.extend(std::iter::repeat(ch).take(count));
+    }
+
     /// Print string
     #[inline]
     pub fn write_string(&mut self, string: &str) {
         self.out.push_str(string);
     }
 
+    /// Write the indentation. The walkers always pass a constant indentation, so this
+    /// is inlined to let the match fold into the direct enter, leave and newline calls.
+    #[inline]
     pub fn write_indentation(&mut self, indentation: Indentation) {
         match indentation {
             Indentation::Indent => self.enter(),
@@ -168,10 +195,12 @@ impl<'p> Printer<'p> {
         self.write_string(NEWLINE);
     }
 
-    /// Print value
+    /// Print value, the value is formatted into the output buffer directly
+    /// without an intermediate string.
     #[inline]
     pub fn write_value<T: std::fmt::Display>(&mut self, value: T) {
-        self.write(&format!("{}", value));
+        // Writing into a `String` never fails.
+        let _ = write!(self.out, "{}", value);
     }
 
     /// Print ast token
@@ -205,15 +234,10 @@ impl<'p> Printer<'p> {
         if !self.cfg.write_comments {
             return false;
         }
-        let mut index = None;
-        for (i, comment) in self.comments.iter().enumerate() {
-            if comment.line <= node.line {
-                index = Some(i);
-            } else {
-                break;
-            }
-        }
-        index.is_some()
+        // Comments are sorted by line, so only the front one needs to be checked.
+        self.comments
+            .front()
+            .map_or(false, |comment| comment.line <= node.line)
     }
 
     /// Print ast comments.
@@ -223,24 +247,11 @@ impl<'p> Printer<'p> {
         }
         if node.line > self.last_ast_line {
             self.last_ast_line = node.line;
-            let mut index = None;
-            for (i, comment) in self.comments.iter().enumerate() {
-                if comment.line <= node.line {
-                    index = Some(i);
-                } else {
-                    break;
-                }
-            }
-            if let Some(index) = index {
-                let mut count = index as isize;
-                while count >= 0 {
-                    match self.comments.pop_front() {
-                        Some(comment) => {
-                            self.writeln(&comment.node.text);
-                        }
-                        None => break,
-                    }
-                    count -= 1;
+            // Pop the sorted comments from the front until the node line is reached,
+            // the remaining comments are never rescanned.
+            while self.has_comments_on_node(node) {
+                if let Some(comment) = self.comments.pop_front() {
+                    self.writeln(&comment.node.text);
                 }
             }
         }
@@ -251,11 +262,13 @@ impl<'p> Printer<'p> {
     // --------------------------
 
     /// Enter with a indent
+    #[inline]
     pub fn enter(&mut self) {
         self.indent += 1;
     }
 
     /// Leave with a dedent
+    #[inline]
     pub fn leave(&mut self) {
         self.indent -= 1;
     }
@@ -1,27 +1,51 @@
-use std::collections::HashSet;
-
 use compiler_base_macros::bug;
 use kclvm_ast::{
     ast::{self, CallExpr},
-    token::{DelimToken, TokenKind},
     walker::MutSelfTypedResultWalker,
 };
 
 use super::{Indentation, Printer};
 
-type ParameterType<'a> = (
-    (&'a ast::NodeRef<ast::Identifier>, Option<String>),
-    &'a Option<ast::NodeRef<ast::Expr>>,
-);
-
 const COMMA_WHITESPACE: &str = ", ";
-const IDENTIFIER_REGEX: &str = r#"^\$?[a-zA-Z_]\w*$"#;
+// Token strings written by the walkers directly, which avoids converting a
+// `TokenKind` into an owned string for every emitted token.
+const COLON: &str = ":";
+const DOT_DOT_DOT: &str = "...";
+const R_ARROW: &str = "->";
+const LEFT_PAREN: &str = "(";
+const RIGHT_PAREN: &str = ")";
+const LEFT_BRACKET: &str = "[";
+const RIGHT_BRACKET: &str = "]";
+const LEFT_BRACE: &str = "{";
+const RIGHT_BRACE: &str = "}";
+
+/// Whether the name is a valid identifier which can be printed without quotes,
+/// e.g., `name`, `_name` and `$name`. The name starts with an ASCII letter or `_`,
+/// and the rest characters are identifier characters accepted by the KCL lexer.
+pub(crate) fn is_identifier(name: &str) -> bool {
+    let name = name.strip_prefix('$').unwrap_or(name);
+    let mut chars = name.chars();
+    match chars.next() {
+        Some(c) if c.is_ascii_alphabetic() || c == '_' => chars.all(rustc_lexer::is_id_continue),
+        _ => false,
+    }
+}
+
+/// Whether all the nodes start on the same line, the scan stops at the first
+/// node on a different line.
+fn all_in_one_line<T>(nodes: &[ast::NodeRef<T>]) -> bool {
+    match nodes.split_first() {
+        Some((first, rest)) => rest.iter().all(|node| node.line == first.line),
+        None => true,
+    }
+}
 
 macro_rules! interleave {
     ($inter: expr, $f: expr, $seq: expr) => {
-        if !$seq.is_empty() {
-            $f(&$seq[0]);
-            for s in &$seq[1..] {
+        // Split the sequence once, there is no per element index bound check.
+        if let Some((first, rest)) = $seq.split_first() {
+            $f(first);
+            for s in rest {
                 $inter();
                 $f(s);
             }
@@ -116,7 +140,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
     fn walk_if_stmt(&mut self, if_stmt: &'ctx ast::IfStmt) -> Self::Result {
         self.write("if ");
         self.expr(&if_stmt.cond);
-        self.write_token(TokenKind::Colon);
+        self.write(COLON);
         self.write_newline_without_fill();
         self.write_indentation(Indentation::Indent);
         self.stmts(&if_stmt.body);
@@ -196,7 +220,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
             self.write(" for ");
             self.walk_identifier(&host_name.node);
         }
-        self.write_token(TokenKind::Colon);
+        self.write(COLON);
         self.write_newline_without_fill();
         self.write_indentation(Indentation::Indent);
 
@@ -225,16 +249,16 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
         }
         if let Some(index_signature) = &schema_stmt.index_signature {
             self.fill("");
-            self.write_token(TokenKind::OpenDelim(DelimToken::Bracket));
+            self.write(LEFT_BRACKET);
             if index_signature.node.any_other {
-                self.write_token(TokenKind::DotDotDot);
+                self.write(DOT_DOT_DOT);
             }
             if let Some(key_name) = &index_signature.node.key_name {
-                self.write(&format!("{}: ", key_name));
+                self.write_value(format_args!("{}: ", key_name));
             }
             self.write(&index_signature.node.key_ty.node.to_string());
-            self.write_token(TokenKind::CloseDelim(DelimToken::Bracket));
-            self.write_token(TokenKind::Colon);
+            self.write(RIGHT_BRACKET);
+            self.write(COLON);
             self.write_space();
             self.write(&index_signature.node.value_ty.node.to_string());
             if let Some(value) = &index_signature.node.value {
@@ -295,7 +319,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
             self.write(" for ");
             self.walk_identifier(&host_name.node);
         }
-        self.write_token(TokenKind::Colon);
+        self.write(COLON);
         // Rule Stmt indent
         self.write_indentation(Indentation::IndentWithNewline);
         if let Some(doc) = &rule_stmt.doc {
@@ -316,8 +340,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
 
     fn walk_quant_expr(&mut self, quant_expr: &'ctx ast::QuantExpr) -> Self::Result {
         let in_one_line = false;
-        let quant_op_string: String = quant_expr.op.clone().into();
-        self.write(&quant_op_string);
+        self.write(quant_expr.op.symbol());
         self.write_space();
         interleave!(
             || self.write(COMMA_WHITESPACE),
@@ -355,7 +378,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
         }
         // A schema string attribute needs quote.
         if !schema_attr.is_ident_attr() {
-            self.write(&format!("{:?}", schema_attr.name.node));
+            self.write_value(format_args!("{:?}", schema_attr.name.node));
         } else {
             self.write_attribute(&schema_attr.name);
         }
@@ -385,11 +408,12 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
     }
 
     fn walk_unary_expr(&mut self, unary_expr: &'ctx ast::UnaryExpr) -> Self::Result {
-        self.write(unary_expr.op.symbol());
         // Four forms: `+expr`, `-expr`, `~expr`, `not expr`
         // `not expr` needs a space between `not` and `expr`
         if matches!(unary_expr.op, ast::UnaryOp::Not) {
-            self.write_space();
+            self.write("not ");
+        } else {
+            self.write(unary_expr.op.symbol());
         }
         self.expr(&unary_expr.operand);
     }
@@ -432,11 +456,11 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
             if let Some(lower) = &subscript.lower {
                 self.expr(lower);
             }
-            self.write_token(TokenKind::Colon);
+            self.write(COLON);
             if let Some(upper) = &subscript.upper {
                 self.expr(upper);
             }
-            self.write_token(TokenKind::Colon);
+            self.write(COLON);
             if let Some(step) = &subscript.step {
                 self.expr(step);
             }
@@ -445,32 +469,22 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
     }
 
     fn walk_paren_expr(&mut self, paren_expr: &'ctx ast::ParenExpr) -> Self::Result {
-        self.write_token(TokenKind::OpenDelim(DelimToken::Paren));
+        self.write(LEFT_PAREN);
         self.expr(&paren_expr.expr);
-        self.write_token(TokenKind::CloseDelim(DelimToken::Paren));
+        self.write(RIGHT_PAREN);
     }
 
     fn walk_list_expr(&mut self, list_expr: &'ctx ast::ListExpr) -> Self::Result {
-        let line_set = list_expr
-            .elts
-            .iter()
-            .map(|e| e.line)
-            .collect::<HashSet<u64>>();
-        // There are comments in the configuration block.
-        let has_comment = !list_expr.elts.is_empty()
-            && list_expr
-                .elts
-                .iter()
-                .map(|e| self.has_comments_on_node(e))
-                .all(|r| r);
         // When there are comments in the configuration block, print them as multiline configurations.
-        let mut in_one_line = line_set.len() <= 1 && !has_comment;
+        // The pending comments are only scanned when the elements are in one line.
+        let mut in_one_line =
+            all_in_one_line(&list_expr.elts) && !self.has_comments_on_all_nodes(&list_expr.elts);
         if let Some(elt) = list_expr.elts.first() {
             if let ast::Expr::ListIfItem(_) = &elt.node {
                 in_one_line = false;
             }
         }
-        self.write_token(TokenKind::OpenDelim(DelimToken::Bracket));
+        self.write(LEFT_BRACKET);
         if !in_one_line {
             self.write_indentation(Indentation::IndentWithNewline);
         }
@@ -486,16 +500,16 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
         if !in_one_line {
             self.write_indentation(Indentation::DedentWithNewline);
         }
-        self.write_token(TokenKind::CloseDelim(DelimToken::Bracket));
+        self.write(RIGHT_BRACKET);
     }
 
     fn walk_list_comp(&mut self, list_comp: &'ctx ast::ListComp) -> Self::Result {
-        self.write_token(TokenKind::OpenDelim(DelimToken::Bracket));
+        self.write(LEFT_BRACKET);
         self.expr(&list_comp.elt);
         for gen in &list_comp.generators {
             self.walk_comp_clause(&gen.node);
         }
-        self.write_token(TokenKind::CloseDelim(DelimToken::Bracket));
+        self.write(RIGHT_BRACKET);
     }
 
     fn walk_list_if_item_expr(
@@ -539,7 +553,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
     }
 
     fn walk_dict_comp(&mut self, dict_comp: &'ctx ast::DictComp) -> Self::Result {
-        self.write_token(TokenKind::OpenDelim(DelimToken::Brace));
+        self.write(LEFT_BRACE);
         self.expr(match &dict_comp.entry.key {
             Some(key) => key,
             None => bug!("Invalid dict comp key"),
@@ -553,7 +567,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
         for gen in &dict_comp.generators {
             self.walk_comp_clause(&gen.node);
         }
-        self.write_token(TokenKind::CloseDelim(DelimToken::Brace));
+        self.write(RIGHT_BRACE);
     }
 
     fn walk_config_if_entry_expr(
@@ -562,7 +576,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
     ) -> Self::Result {
         self.write("if ");
         self.expr(&config_if_entry_expr.if_cond);
-        self.write_token(TokenKind::Colon);
+        self.write(COLON);
         self.write_indentation(Indentation::IndentWithNewline);
         interleave!(
             || self.write_newline(),
@@ -609,25 +623,19 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
     fn walk_schema_expr(&mut self, schema_expr: &'ctx ast::SchemaExpr) -> Self::Result {
         self.walk_identifier(&schema_expr.name.node);
         if !schema_expr.args.is_empty() || !schema_expr.kwargs.is_empty() {
-            self.write_token(TokenKind::OpenDelim(DelimToken::Paren));
+            self.write(LEFT_PAREN);
             self.write_args_and_kwargs(&schema_expr.args, &schema_expr.kwargs);
-            self.write_token(TokenKind::CloseDelim(DelimToken::Paren));
+            self.write(RIGHT_PAREN);
         }
         self.write_space();
         self.expr(&schema_expr.config)
     }
 
     fn walk_config_expr(&mut self, config_expr: &'ctx ast::ConfigExpr) -> Self::Result {
-        let line_set: HashSet<u64> = config_expr.items.iter().map(|item| item.line).collect();
-        // There are comments in the configuration block.
-        let has_comment = !config_expr.items.is_empty()
-            && config_expr
-                .items
-                .iter()
-                .map(|item| self.has_comments_on_node(item))
-                .all(|r| r);
         // When there are comments in the configuration block, print them as multiline configurations.
-        let mut in_one_line = line_set.len() <= 1 && !has_comment;
+        // The pending comments are only scanned when the items are in one line.
+        let mut in_one_line = all_in_one_line(&config_expr.items)
+            && !self.has_comments_on_all_nodes(&config_expr.items);
         // When there are complex configuration blocks in the configuration block, print them as multiline configurations.
         if config_expr.items.len() == 1 && in_one_line {
             if let Some(item) = config_expr.items.first() {
@@ -639,7 +647,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
                 }
             }
         }
-        self.write_token(TokenKind::OpenDelim(DelimToken::Brace));
+        self.write(LEFT_BRACE);
         if !config_expr.items.is_empty() {
             if !in_one_line {
                 self.write_indentation(Indentation::IndentWithNewline);
@@ -657,7 +665,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
                 self.write_indentation(Indentation::DedentWithNewline);
             }
         }
-        self.write_token(TokenKind::CloseDelim(DelimToken::Brace));
+        self.write(RIGHT_BRACE);
     }
 
     fn walk_check_expr(&mut self, check_expr: &'ctx ast::CheckExpr) -> Self::Result {
@@ -680,12 +688,12 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
         }
         if let Some(ty_str) = &lambda_expr.return_ty {
             self.write_space();
-            self.write_token(TokenKind::RArrow);
+            self.write(R_ARROW);
             self.write_space();
             self.write(&ty_str.node.to_string());
         }
         self.write_space();
-        self.write_token(TokenKind::OpenDelim(DelimToken::Brace));
+        self.write(LEFT_BRACE);
         self.write_newline_without_fill();
         self.write_indentation(Indentation::Indent);
 
@@ -694,7 +702,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
 
         self.write_indentation(Indentation::Dedent);
         self.fill("");
-        self.write_token(TokenKind::CloseDelim(DelimToken::Brace));
+        self.write(RIGHT_BRACE);
     }
 
     fn walk_keyword(&mut self, keyword: &'ctx ast::Keyword) -> Self::Result {
@@ -706,32 +714,27 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
     }
 
     fn walk_arguments(&mut self, arguments: &'ctx ast::Arguments) -> Self::Result {
-        let parameter_zip_list: Vec<ParameterType<'_>> = arguments
+        // Walk the three parallel lists in one pass without collecting them
+        // into a temporary vector or cloning the type annotation nodes.
+        let params = arguments
             .args
             .iter()
-            .zip(
-                arguments
-                    .ty_list
-                    .iter()
-                    .map(|ty| ty.clone().map(|n| n.node.to_string())),
-            )
-            .zip(arguments.defaults.iter())
-            .collect();
-        interleave!(
-            || self.write(COMMA_WHITESPACE),
-            |para: &ParameterType<'_>| {
-                let ((arg, ty_str), default) = para;
-                self.walk_identifier(&arg.node);
-                if let Some(ty_str) = ty_str {
-                    self.write(&format!(": {}", ty_str));
-                }
-                if let Some(default) = default {
-                    self.write(" = ");
-                    self.expr(default);
-                }
-            },
-            parameter_zip_list
-        );
+            .zip(&arguments.ty_list)
+            .zip(&arguments.defaults);
+        for (i, ((arg, ty), default)) in params.enumerate() {
+            if i > 0 {
+                self.write(COMMA_WHITESPACE);
+            }
+            self.walk_identifier(&arg.node);
+            if let Some(ty) = ty {
+                self.write(": ");
+                self.write(&ty.node.to_string());
+            }
+            if let Some(default) = default {
+                self.write(" = ");
+                self.expr(default);
+            }
+        }
     }
 
     fn walk_compare(&mut self, compare: &'ctx ast::Compare) -> Self::Result {
@@ -746,13 +749,18 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
 
     #[inline]
     fn walk_identifier(&mut self, identifier: &'ctx ast::Identifier) -> Self::Result {
-        self.write(&identifier.get_name());
+        // Write the dotted names directly instead of cloning and joining them.
+        interleave!(
+            || self.write("."),
+            |name: &ast::Node<String>| self.write(&name.node),
+            identifier.names
+        );
     }
 
     fn walk_number_lit(&mut self, number_lit: &'ctx ast::NumberLit) -> Self::Result {
         match &number_lit.value {
-            ast::NumberLitValue::Int(int_val) => self.write(&int_val.to_string()),
-            ast::NumberLitValue::Float(float_val) => self.write(&float_val.to_string()),
+            ast::NumberLitValue::Int(int_val) => self.write_value(int_val),
+            ast::NumberLitValue::Float(float_val) => self.write_value(float_val),
         }
         // Number suffix e.g., 1Gi
         if let Some(binary_suffix) = &number_lit.binary_suffix {
@@ -764,11 +772,14 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
         if !string_lit.raw_value.is_empty() {
             self.write(&string_lit.raw_value)
         } else {
-            self.write(&if string_lit.is_long_string {
-                format!("\"\"\"{}\"\"\"", string_lit.value.replace('\"', "\\\""))
+            let quote_str = if string_lit.is_long_string {
+                "\"\"\""
             } else {
-                format!("\"{}\"", string_lit.value.replace('\"', "\\\""))
-            });
+                "\""
+            };
+            self.write(quote_str);
+            self.write_quote_escaped(&string_lit.value);
+            self.write(quote_str);
         }
     }
 
@@ -790,7 +801,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
         for value in &joined_string.values {
             match &value.node {
                 ast::Expr::StringLit(string_lit) => {
-                    self.write(&string_lit.value.replace('\"', "\\\""));
+                    self.write_quote_escaped(&string_lit.value);
                 }
                 _ => self.expr(value),
             }
@@ -802,7 +813,7 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
         self.write("${");
         self.expr(&formatted_value.value);
         if let Some(spec) = &formatted_value.format_spec {
-            self.write(&format!(": {}", spec));
+            self.write_value(format_args!(": {}", spec));
         }
         self.write("}");
     }
@@ -818,6 +829,24 @@ impl<'p, 'ctx> MutSelfTypedResultWalker<'ctx> for Printer<'p> {
 }
 
 impl<'p> Printer<'p> {
+    /// Whether there are comments on all the nodes in the configuration block.
+    fn has_comments_on_all_nodes<T>(&mut self, nodes: &[ast::NodeRef<T>]) -> bool {
+        !nodes.is_empty() && nodes.iter().all(|node| self.has_comments_on_node(node))
+    }
+
+    /// Write the string value with its double quotes escaped, the escaped
+    /// string is written piece by piece instead of being allocated.
+    fn write_quote_escaped(&mut self, value: &str) {
+        let mut parts = value.split('"');
+        if let Some(first) = parts.next() {
+            self.write(first);
+        }
+        for part in parts {
+            self.write("\\\"");
+            self.write(part);
+        }
+    }
+
     pub fn write_args_and_kwargs(
         &mut self,
         args: &[ast::NodeRef<ast::Expr>],
@@ -839,7 +868,7 @@ impl<'p> Printer<'p> {
             Some(key) => {
                 let print_right_brace_count = self.write_config_key(key);
                 if item.node.insert_index >= 0 {
-                    self.write(&format!("[{}]", item.node.insert_index));
+                    self.write_value(format_args!("[{}]", item.node.insert_index));
                 }
                 if !matches!(item.node.operation, ast::ConfigEntryOperation::Union) {
                     self.write_space();
@@ -847,7 +876,10 @@ impl<'p> Printer<'p> {
                 self.write(item.node.operation.symbol());
                 self.write_space();
                 self.expr(&item.node.value);
-                self.write(&"}".repeat(print_right_brace_count));
+                // Close the nested key braces without allocating a repeated string per entry.
+                for _ in 0..print_right_brace_count {
+                    self.write(RIGHT_BRACE);
+                }
             }
             None => {
                 if !matches!(&item.node.value.node, ast::Expr::ConfigIfEntry(_)) {
@@ -866,15 +898,12 @@ impl<'p> Printer<'p> {
                 // Judge contains string or dot identifier, e.g., "x-y-z" and "a.b.c"
                 let names = &identifier.names;
 
-                let re = fancy_regex::Regex::new(IDENTIFIER_REGEX).unwrap();
-                let need_right_brace = !names.iter().all(|n| re.is_match(&n.node).unwrap_or(false));
+                let need_right_brace = !names.iter().all(|n| is_identifier(&n.node));
                 let count = if need_right_brace {
-                    self.write(
-                        &names
-                            .iter()
-                            .map(|n| format!("{:?}", n.node))
-                            .collect::<Vec<String>>()
-                            .join(": {"),
+                    interleave!(
+                        || self.write(": {"),
+                        |n: &ast::Node<String>| self.write_value(format_args!("{:?}", n.node)),
+                        names
                     );
                     names.len() - 1
                 } else {
@@ -892,10 +921,9 @@ impl<'p> Printer<'p> {
     }
 
     fn write_attribute(&mut self, attr: &ast::NodeRef<String>) {
-        let re = fancy_regex::Regex::new(IDENTIFIER_REGEX).unwrap();
-        let need_quote = !re.is_match(&attr.node).unwrap();
+        let need_quote = !is_identifier(&attr.node);
         if need_quote {
-            self.write(&format!("{:?}", attr.node));
+            self.write_value(format_args!("{:?}", attr.node));
         } else {
             self.write(&attr.node);
         };
@@ -929,18 +957,16 @@ impl<'p> Printer<'p> {
     }
 
     pub fn stmts(&mut self, stmts: &[ast::NodeRef<ast::Stmt>]) {
-        let mut prev_stmt: Option<ast::Stmt> = None;
+        // Only the kind of the previous statement is needed, there is no need to
+        // clone the statements themselves.
+        let mut prev_is_import = false;
         for stmt in stmts {
-            let import_stmt_alter = match (prev_stmt.as_ref(), stmt.as_ref().node.to_owned()) {
-                (Some(ast::Stmt::Import(_)), ast::Stmt::Import(_)) => false,
-                (Some(ast::Stmt::Import(_)), _) => true,
-                _ => false,
-            };
-            if import_stmt_alter {
+            let is_import = matches!(stmt.node, ast::Stmt::Import(_));
+            if prev_is_import && !is_import {
                 self.write_newline();
             }
             self.stmt(stmt);
-            prev_stmt = Some(stmt.node.to_owned());
+            prev_is_import = is_import;
         }
     }
 }
@@ -1,5 +1,6 @@
 use std::path::{Path, PathBuf};
 
+use super::node::is_identifier;
 use super::print_ast_module;
 use kclvm_parser::parse_file_force_errors;
 use pretty_assertions::assert_eq;
@@ -15,11 +16,13 @@ const TEST_CASES: &[&str] = &[
     "codelayout",
     "collection_if",
     "comment",
+    "comments",
     "index_sign",
     "joined_str",
     "lambda",
     "orelse",
     "quant",
+    "quoted_key",
     "rule",
     "str",
     "type_alias",
@@ -63,3 +66,13 @@ fn test_ast_printer() {
         assert_eq!(data_input, data_output, "Test failed on {}", case);
     }
 }
+
+#[test]
+fn test_is_identifier() {
+    for name in ["name", "_name", "$name", "name_1", "a名"] {
+        assert!(is_identifier(name), "{} should be an identifier", name);
+    }
+    for name in ["", "$", "1name", "a-b", "a.b", "a²", "a½", "a①", "名字"] {
+        assert!(!is_identifier(name), "{} should not be an identifier", name);
+    }
+}
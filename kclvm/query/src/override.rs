@@ -5,7 +5,6 @@ use anyhow::{anyhow, Result};
 use compiler_base_macros::bug;
 use kclvm_ast::ast;
 use kclvm_ast::config::try_get_config_expr_mut;
-use kclvm_ast::path::get_key_path;
 use kclvm_ast::walk_list_mut;
 use kclvm_ast::walker::MutSelfMutWalker;
 use kclvm_ast::MAIN_PKG;
@@ -44,15 +43,42 @@ pub fn apply_overrides(
     import_paths: &[String],
     print_ast: bool,
 ) -> Result<()> {
-    for o in overrides {
-        if let Some(modules) = prog.pkgs.get_mut(MAIN_PKG) {
-            for m in modules.iter_mut() {
-                if apply_override_on_module(m, o, import_paths)? && print_ast {
+    if let Some(modules) = prog.pkgs.get_mut(MAIN_PKG) {
+        let mut modified = vec![false; modules.len()];
+        let result = apply_overrides_on_modules(modules, overrides, import_paths, &mut modified);
+        // Print each modified module once after the overrides are applied instead of
+        // rewriting the file for every override. The modules modified by the overrides
+        // before an error are still printed.
+        if print_ast {
+            for (m, modified) in modules.iter().zip(modified) {
+                if modified {
                     let code_str = print_ast_module(m);
                     std::fs::write(&m.filename, &code_str)?
                 }
             }
         }
+        result?;
+    }
+    Ok(())
+}
+
+/// Apply the overrides on the modules in order and mark the modified modules.
+fn apply_overrides_on_modules(
+    modules: &mut [ast::Module],
+    overrides: &[String],
+    import_paths: &[String],
+    modified: &mut [bool],
+) -> Result<()> {
+    for o in overrides {
+        // Parse the override spec and build its value expression once, then clone the
+        // expression for every module, which is cheaper than parsing the value string again.
+        let o = parse_override_spec(o)?;
+        let value = build_expr_from_string(&o.field_value);
+        for (i, m) in modules.iter_mut().enumerate() {
+            if apply_override_spec_on_module(m, &o, value.clone(), import_paths)? {
+                modified[i] = true;
+            }
+        }
     }
     Ok(())
 }
@@ -100,14 +126,24 @@ pub fn apply_override_on_module(
     m: &mut ast::Module,
     o: &str,
     import_paths: &[String],
+) -> Result<bool> {
+    let o = parse_override_spec(o)?;
+    let value = build_expr_from_string(&o.field_value);
+    apply_override_spec_on_module(m, &o, value, import_paths)
+}
+
+/// Apply the parsed override specification with its built value expression on the AST module.
+fn apply_override_spec_on_module(
+    m: &mut ast::Module,
+    o: &ast::OverrideSpec,
+    value: Option<ast::NodeRef<ast::Expr>>,
+    import_paths: &[String],
 ) -> Result<bool> {
     // Apply import paths on AST module.
     apply_import_paths_on_module(m, import_paths)?;
-    let o = parse_override_spec(o)?;
     let ss = parse_attribute_path(&o.field_path)?;
     let default = String::default();
     let target_id = ss.get(0).unwrap_or(&default);
-    let value = &o.field_value;
     let key = ast::Identifier {
         names: ss[1..]
             .iter()
@@ -130,11 +166,11 @@ pub fn apply_override_on_module(
         target_id: target_id.to_string(),
         field_paths: ss[1..].to_vec(),
         override_key: key,
-        override_value: build_expr_from_string(value),
+        override_value: value,
         override_target_count: 0,
         has_override: false,
-        action: o.action,
-        operation: o.operation,
+        action: o.action.clone(),
+        operation: o.operation.clone(),
     };
     transformer.walk_module(m);
     Ok(transformer.has_override)
@@ -184,62 +220,72 @@ pub fn parse_override_spec(spec: &str) -> Result<ast::OverrideSpec> {
 /// split_override_spec_op split the override_spec and do not split the override_op in list
 /// expr, dict expr and string e.g., "a.b=1" -> (a.b, 1, =), "a["a=1"]=1" -> (a["a=1"], =, 1)
 pub fn split_override_spec_op(spec: &str) -> Option<(String, String, ast::ConfigEntryOperation)> {
+    // All the delimiters are ASCII characters, so the spec can be scanned byte by byte
+    // in one pass, and every matched index is a valid char boundary to split at.
+    let bytes = spec.as_bytes();
+    let mut depth = 0usize;
     let mut i = 0;
-    let mut stack = String::new();
-    while i < spec.chars().count() {
-        let (c_idx, c) = spec.char_indices().nth(i).unwrap();
-        if c == '=' && stack.is_empty() {
-            return Some((
-                spec[..c_idx].to_string(),
-                spec[c_idx + 1..].to_string(),
-                ast::ConfigEntryOperation::Override,
-            ));
-        } else if c == ':' && stack.is_empty() {
-            return Some((
-                spec[..c_idx].to_string(),
-                spec[c_idx + 1..].to_string(),
-                ast::ConfigEntryOperation::Union,
-            ));
-        } else if c == '+' && stack.is_empty() {
-            if let Some((c_next_idx, c_next)) = spec.char_indices().nth(i + 1) {
-                if c_next == '=' {
-                    return Some((
-                        spec[..c_idx].to_string(),
-                        spec[c_next_idx + 1..].to_string(),
-                        ast::ConfigEntryOperation::Insert,
-                    ));
-                }
+    while i < bytes.len() {
+        match bytes[i] {
+            b'=' if depth == 0 => {
+                return Some((
+                    spec[..i].to_string(),
+                    spec[i + 1..].to_string(),
+                    ast::ConfigEntryOperation::Override,
+                ));
             }
-        }
-        // List/Dict type
-        else if c == '[' || c == '{' {
-            stack.push(c);
-        }
-        // List/Dict type
-        else if c == ']' || c == '}' {
-            stack.pop();
-        }
-        // String literal type
-        else if c == '\"' {
-            let t: String = spec.chars().skip(i).collect();
-            let re = fancy_regex::Regex::new(r#""(?!"").*?(?<!\\)(\\\\)*?""#).unwrap();
-            if let Ok(Some(v)) = re.find(&t) {
-                i += v.as_str().chars().count() - 1;
+            b':' if depth == 0 => {
+                return Some((
+                    spec[..i].to_string(),
+                    spec[i + 1..].to_string(),
+                    ast::ConfigEntryOperation::Union,
+                ));
             }
-        }
-        // String literal type
-        else if c == '\'' {
-            let t: String = spec.chars().skip(i).collect();
-            let re = fancy_regex::Regex::new(r#"'(?!'').*?(?<!\\)(\\\\)*?'"#).unwrap();
-            if let Ok(Some(v)) = re.find(&t) {
-                i += v.as_str().chars().count() - 1;
+            b'+' if depth == 0 && bytes.get(i + 1) == Some(&b'=') => {
+                return Some((
+                    spec[..i].to_string(),
+                    spec[i + 2..].to_string(),
+                    ast::ConfigEntryOperation::Insert,
+                ));
+            }
+            // List/Dict type
+            b'[' | b'{' => depth += 1,
+            // List/Dict type
+            b']' | b'}' => depth = depth.saturating_sub(1),
+            // String literal type
+            b'"' | b'\'' => {
+                if let Some(end) = find_string_lit_end(bytes, i) {
+                    i = end;
+                }
             }
+            _ => {}
         }
         i += 1;
     }
     None
 }
 
+/// Returns the index of the quote which closes the string literal started at `start`,
+/// the quotes escaped by backslashes are skipped.
+fn find_string_lit_end(bytes: &[u8], start: usize) -> Option<usize> {
+    let quote = bytes[start];
+    // A triple quote opener is not skipped as a string literal, the same as the
+    // former `"(?!"")` regex lookahead.
+    if bytes.get(start + 1) == Some(&quote) && bytes.get(start + 2) == Some(&quote) {
+        return None;
+    }
+    let mut i = start + 1;
+    while i < bytes.len() {
+        match bytes[i] {
+            b'\\' => i += 2,
+            b'\n' => return None,
+            c if c == quote => return Some(i),
+            _ => i += 1,
+        }
+    }
+    None
+}
+
 // Transform the AST module with the import path list.
 fn apply_import_paths_on_module(m: &mut ast::Module, import_paths: &[String]) -> Result<()> {
     if import_paths.is_empty() {
@@ -256,7 +302,8 @@ fn apply_import_paths_on_module(m: &mut ast::Module, import_paths: &[String]) ->
         }
     }
 
-    let mut new_imports_count = 0;
+    // The new import statements with their insert indices, which are increasing.
+    let mut new_imports = vec![];
 
     for (i, path) in import_paths.iter().enumerate() {
         let line: u64 = i as u64 + 1;
@@ -283,10 +330,37 @@ fn apply_import_paths_on_module(m: &mut ast::Module, import_paths: &[String]) ->
             // i denotes the space len between the `import` keyword and the path.
             ("import".len() + path.len() + 1) as u64,
         ));
-        new_imports_count += 1;
-        m.body.insert((line - 1) as usize, import_stmt)
+        new_imports.push(((line - 1) as usize, import_stmt));
     }
 
+    let new_imports_count = new_imports.len();
+    if new_imports_count == 0 {
+        return Ok(());
+    }
+    // Merge the new import statements into the module body in one pass instead of
+    // inserting them one by one, which shifts the rest of the body for each import.
+    let mut body = Vec::with_capacity(m.body.len() + new_imports_count);
+    let mut new_imports = new_imports.into_iter().peekable();
+    for stmt in std::mem::take(&mut m.body) {
+        while let Some((_, import_stmt)) = new_imports.next_if(|(index, _)| *index <= body.len()) {
+            body.push(import_stmt);
+        }
+        body.push(stmt);
+    }
+    // The new imports whose indices are out of the module body are placed after the
+    // last import statement, or at the top of the module without import statements.
+    if new_imports.peek().is_some() {
+        let index = body
+            .iter()
+            .rposition(|stmt| matches!(stmt.node, ast::Stmt::Import(_)))
+            .map_or(0, |i| i + 1);
+        body.splice(
+            index..index,
+            new_imports.map(|(_, import_stmt)| import_stmt),
+        );
+    }
+    m.body = body;
+
     // Walk the AST module to update the line number of the all the nodes except the import statement.
     let mut nlw = AstNodeMover {
         line_offset: new_imports_count,
@@ -297,6 +371,35 @@ fn apply_import_paths_on_module(m: &mut ast::Module, import_paths: &[String]) ->
     Ok(())
 }
 
+/// Whether the config entry key path equals `part`. It has the same result as
+/// `get_key_path(key) == part`, but matches the identifier names in place instead
+/// of joining them into a new string for every config entry.
+pub(crate) fn is_key_path_matched(key: &Option<ast::NodeRef<ast::Expr>>, part: &str) -> bool {
+    match key {
+        Some(key) => match &key.node {
+            ast::Expr::Identifier(identifier) => {
+                let mut rest = part;
+                for (i, name) in identifier.names.iter().enumerate() {
+                    if i > 0 {
+                        match rest.strip_prefix('.') {
+                            Some(r) => rest = r,
+                            None => return false,
+                        }
+                    }
+                    match rest.strip_prefix(name.node.as_str()) {
+                        Some(r) => rest = r,
+                        None => return false,
+                    }
+                }
+                rest.is_empty()
+            }
+            ast::Expr::StringLit(string_lit) => string_lit.value == part,
+            _ => part.is_empty(),
+        },
+        None => part.is_empty(),
+    }
+}
+
 /// OverrideTransformer is used to walk AST and transform it with the override values.
 struct OverrideTransformer {
     pub target_id: String,
@@ -323,17 +426,11 @@ impl<'ctx> MutSelfMutWalker<'ctx> for OverrideTransformer {
                 module.body.iter_mut().for_each(|stmt| {
                     if let ast::Stmt::Assign(assign_stmt) = &mut stmt.node {
                         if assign_stmt.targets.len() == 1 && self.field_paths.len() == 0 {
-                            let target =
-                                &Some(Box::new(ast::Node::dummy_node(ast::Expr::Identifier(
-                                    assign_stmt.targets.get(0).unwrap().node.clone(),
-                                ))));
-                            let target = get_key_path(target);
+                            let target = assign_stmt.targets[0].node.get_name();
                             if target == self.target_id {
-                                let item = assign_stmt.value.clone();
-
                                 let mut value = self.clone_override_value();
                                 // Use position information that needs to override the expression.
-                                value.set_pos(item.pos());
+                                value.set_pos(assign_stmt.value.pos());
                                 // Override the node value.
                                 assign_stmt.value = value;
                                 self.has_override = true;
@@ -349,11 +446,9 @@ impl<'ctx> MutSelfMutWalker<'ctx> for OverrideTransformer {
                             ),
                         };
                         if target.node == self.target_id {
-                            let item = unification_stmt.value.clone();
-
                             let mut value = self.clone_override_value();
                             // Use position information that needs to override the expression.
-                            value.set_pos(item.pos());
+                            value.set_pos(unification_stmt.value.pos());
 
                             // Unification is only support to override the schema expression.
                             if let ast::Expr::Schema(schema_expr) = value.node {
@@ -372,11 +467,7 @@ impl<'ctx> MutSelfMutWalker<'ctx> for OverrideTransformer {
                 module.body.retain(|stmt| {
                     if let ast::Stmt::Assign(assign_stmt) = &stmt.node {
                         if assign_stmt.targets.len() == 1 && self.field_paths.len() == 0 {
-                            let target =
-                                &Some(Box::new(ast::Node::dummy_node(ast::Expr::Identifier(
-                                    assign_stmt.targets.get(0).unwrap().node.clone(),
-                                ))));
-                            let target = get_key_path(target);
+                            let target = assign_stmt.targets[0].node.get_name();
                             if target == self.target_id {
                                 self.has_override = true;
                                 return false;
@@ -401,7 +492,11 @@ impl<'ctx> MutSelfMutWalker<'ctx> for OverrideTransformer {
             }
         }
 
-        walk_list_mut!(self, walk_stmt, module.body);
+        // The module level pass may already apply the override, then there is no need to
+        // walk the statements again.
+        if !self.has_override {
+            walk_list_mut!(self, walk_stmt, module.body);
+        }
 
         // If the variable is not found, add a new variable with the override value.
         if !self.has_override {
@@ -609,13 +704,9 @@ impl OverrideTransformer {
     /// Lookup schema config all fields and replace if it is matched with the override spec,
     /// return whether is found a replaced one.
     fn lookup_config_and_replace(&self, config_expr: &mut ast::ConfigExpr) -> bool {
-        // Split a path into multiple parts. `a.b.c` -> ["a", "b", "c"]
-        let parts = self
-            .field_paths
-            .iter()
-            .map(|s| s.as_str())
-            .collect::<Vec<&str>>();
-        self.replace_config_with_path_parts(config_expr, &parts)
+        // The path parts `a.b.c` -> ["a", "b", "c"] are split once when the transformer
+        // is built, and are reused for every config lookup.
+        self.replace_config_with_path_parts(config_expr, &self.field_paths)
     }
 
     /// Replace AST config expr with one part of path. The implementation of this function
@@ -623,14 +714,14 @@ impl OverrideTransformer {
     fn replace_config_with_path_parts(
         &self,
         config_expr: &mut ast::ConfigExpr,
-        parts: &[&str],
+        parts: &[String],
     ) -> bool {
         // Do not replace empty path parts and out of index parts on the config expression.
         if parts.is_empty() {
             return false;
         }
         // Always take the first part to match, because recursive search is required.
-        let part = parts[0];
+        let part = &parts[0];
         let mut delete_index_set = HashSet::new();
         let mut changed = false;
         // Loop all entries in the config expression and replace, because there may be duplicate
@@ -641,7 +732,7 @@ impl OverrideTransformer {
             // - `get_path_key` returns the real config key name.
             // For example, the real config node is `a: {b: c: {}}`. The path
             // that needs to be modified is `a.b.c`, and its parts are ["a", "b", "c"].
-            if part == get_key_path(&item.node.key) {
+            if is_key_path_matched(&item.node.key, part) {
                 // When the last part of the path is successfully recursively matched,
                 // it indicates that the original value that needs to be overwritten
                 // is successfully found, and the new value is used to overwrite it.
@@ -678,16 +769,13 @@ impl OverrideTransformer {
         }
         // Delete entries according delete index set.
         if !delete_index_set.is_empty() {
-            let items: Vec<(usize, &ast::NodeRef<ast::ConfigEntry>)> = config_expr
-                .items
-                .iter()
-                .enumerate()
-                .filter(|(i, _)| !delete_index_set.contains(i))
-                .collect();
-            config_expr.items = items
-                .iter()
-                .map(|(_, item)| <&ast::NodeRef<ast::ConfigEntry>>::clone(item).clone())
-                .collect();
+            // Remove the entries in place, the kept entries are moved instead of cloned.
+            let mut index = 0;
+            config_expr.items.retain(|_| {
+                let keep = !delete_index_set.contains(&index);
+                index += 1;
+                keep
+            });
         } else if let ast::OverrideAction::CreateOrUpdate = self.action {
             if !changed {
                 let key = ast::Identifier {
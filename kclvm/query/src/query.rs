@@ -5,7 +5,7 @@ use indexmap::IndexMap;
 use kclvm_parser::{load_program, LoadProgramOptions, ParseSession};
 use kclvm_sema::{
     resolver::{resolve_program_with_opts, scope::Scope, Options},
-    ty::SchemaType,
+    ty::{SchemaType, TypeKind},
 };
 
 /// Get schema type kind.
@@ -19,6 +19,18 @@ pub enum GetSchemaOption {
     All,
 }
 
+impl GetSchemaOption {
+    /// Whether a schema instance or definition is accepted by the option.
+    #[inline]
+    fn accepts(&self, is_instance: bool) -> bool {
+        match self {
+            GetSchemaOption::All => true,
+            GetSchemaOption::Definitions => !is_instance,
+            GetSchemaOption::Instances => is_instance,
+        }
+    }
+}
+
 impl Default for GetSchemaOption {
     fn default() -> Self {
         GetSchemaOption::All
@@ -80,7 +92,6 @@ pub fn get_schema_type(
     schema_name: Option<&str>,
     opt: GetSchemaOption,
 ) -> Result<IndexMap<String, SchemaType>> {
-    let mut result = IndexMap::new();
     let scope = resolve_file(&CompilationOptions {
         k_files: vec![file.to_string()],
         loader_opts: code.map(|c| LoadProgramOptions {
@@ -93,27 +104,10 @@ pub fn get_schema_type(
         },
         get_schema_opts: opt.clone(),
     })?;
-    for (name, o) in &scope.borrow().elems {
-        if o.borrow().ty.is_schema() {
-            let schema_ty = o.borrow().ty.into_schema_type();
-            if opt == GetSchemaOption::All
-                || (opt == GetSchemaOption::Definitions && !schema_ty.is_instance)
-                || (opt == GetSchemaOption::Instances && schema_ty.is_instance)
-            {
-                // Schema name filter
-                match schema_name {
-                    Some(schema_name) => {
-                        if schema_name == name {
-                            result.insert(name.to_string(), schema_ty);
-                        }
-                    }
-                    None => {
-                        result.insert(name.to_string(), schema_ty);
-                    }
-                }
-            }
-        }
-    }
+    let result = collect_schema_types(&scope.borrow(), &opt, |name| match schema_name {
+        Some(schema_name) => schema_name == name,
+        None => true,
+    });
     Ok(result)
 }
 
@@ -160,41 +154,37 @@ pub fn get_full_schema_type(
     schema_name: Option<&str>,
     opts: CompilationOptions,
 ) -> Result<IndexMap<String, SchemaType>> {
-    let mut result = IndexMap::new();
     let scope = resolve_file(&opts)?;
-    for (name, o) in &scope.borrow().elems {
-        if o.borrow().ty.is_schema() {
-            let mut schema_ty = o.borrow().ty.into_schema_type();
-            if let Some(base) = &schema_ty.base {
-                schema_ty.base = Some(Box::new(get_full_schema_type_recursive(*base.clone())?));
-            }
-            if opts.get_schema_opts == GetSchemaOption::All
-                || (opts.get_schema_opts == GetSchemaOption::Definitions && !schema_ty.is_instance)
-                || (opts.get_schema_opts == GetSchemaOption::Instances && schema_ty.is_instance)
-            {
-                // Schema name filter
-                match schema_name {
-                    Some(schema_name) => {
-                        if schema_name.is_empty() || schema_name == name {
-                            result.insert(name.to_string(), schema_ty);
-                        }
-                    }
-                    None => {
-                        result.insert(name.to_string(), schema_ty);
-                    }
-                }
-            }
-        }
-    }
+    // The schema types in the scope are owned copies with their full base schema chain,
+    // so no further traversal of the base schemas is required.
+    let name_filter = |name: &str| match schema_name {
+        Some(schema_name) => schema_name.is_empty() || schema_name == name,
+        None => true,
+    };
+    let result = collect_schema_types(&scope.borrow(), &opts.get_schema_opts, name_filter);
     Ok(result)
 }
 
-fn get_full_schema_type_recursive(schema_ty: SchemaType) -> Result<SchemaType> {
-    let mut result = schema_ty;
-    if let Some(base) = result.base {
-        result.base = Some(Box::new(get_full_schema_type_recursive(*base)?));
+/// Collect the schema types matched with the schema option and the schema name
+/// filter in one traversal of the scope elements.
+fn collect_schema_types(
+    scope: &Scope,
+    opt: &GetSchemaOption,
+    name_filter: impl Fn(&str) -> bool,
+) -> IndexMap<String, SchemaType> {
+    let mut result = IndexMap::new();
+    for (name, o) in &scope.elems {
+        // Filter the schema name and kind before copying the schema type.
+        if !name_filter(name.as_str()) {
+            continue;
+        }
+        if let TypeKind::Schema(schema_ty) = &o.borrow().ty.kind {
+            if opt.accepts(schema_ty.is_instance) {
+                result.insert(name.to_string(), schema_ty.clone());
+            }
+        }
     }
-    Ok(result)
+    result
 }
 
 fn resolve_file(opts: &CompilationOptions) -> Result<Rc<RefCell<Scope>>> {
@@ -1,10 +1,14 @@
 use std::{
+    collections::HashMap,
     fs::{self, File},
     io::Read,
     path::PathBuf,
 };
 
-use super::{r#override::apply_override_on_module, *};
+use super::{
+    r#override::{apply_override_on_module, is_key_path_matched},
+    *,
+};
 use crate::{
     path::parse_attribute_path, r#override::parse_override_spec, selector::list_variables,
 };
@@ -95,6 +99,36 @@ fn test_override_file_import_paths() {
     )
 }
 
+/// Test the new import statements are inserted at the indices of the import path list
+/// between the existing ones, and placed after the last import statement when the index
+/// is out of the module body.
+#[test]
+fn test_apply_import_paths_on_module() {
+    let cases = [
+        (
+            "import pkg.a\nimport pkg.c\nx = 1\n",
+            vec!["pkg.a", "pkg.b", "pkg.c", "pkg.d"],
+            "import pkg.a\nimport pkg.b\nimport pkg.c\nimport pkg.d\n\nx = 2\n",
+        ),
+        (
+            "x = 1\n",
+            vec!["pkg.a", "pkg.b"],
+            "import pkg.a\nimport pkg.b\n\nx = 2\n",
+        ),
+        (
+            "import pkg.a\nx = 1\n",
+            vec!["pkg.a", "pkg.a", "pkg.a", "pkg.b"],
+            "import pkg.a\nimport pkg.b\n\nx = 2\n",
+        ),
+    ];
+    for (code, import_paths, expected) in cases {
+        let import_paths: Vec<String> = import_paths.iter().map(|p| p.to_string()).collect();
+        let mut module = parse_file_force_errors("test.k", Some(code.to_string())).unwrap();
+        apply_override_on_module(&mut module, "x=2", &import_paths).unwrap();
+        assert_eq!(print_ast_module(&module), expected, "{code} test failed");
+    }
+}
+
 /// Test override_file result with the expected modified AST.
 #[test]
 fn test_override_file_config() {
@@ -197,6 +231,93 @@ var4: AppConfiguration {image: 'image'}
     );
 }
 
+/// Test the config entry key is matched with the whole key path instead of its prefix.
+#[test]
+fn test_is_key_path_matched() {
+    use kclvm_ast::ast;
+    let identifier_key = |names: &[&str]| {
+        Some(Box::new(ast::Node::dummy_node(ast::Expr::Identifier(
+            ast::Identifier {
+                names: names
+                    .iter()
+                    .map(|name| ast::Node::dummy_node(name.to_string()))
+                    .collect(),
+                pkgpath: "".to_string(),
+                ctx: ast::ExprContext::Load,
+            },
+        ))))
+    };
+    let string_key = |value: &str| {
+        Some(Box::new(ast::Node::dummy_node(ast::Expr::StringLit(
+            ast::StringLit {
+                is_long_string: false,
+                raw_value: format!("{value:?}"),
+                value: value.to_string(),
+            },
+        ))))
+    };
+    // Identifier keys.
+    assert!(is_key_path_matched(&identifier_key(&["a"]), "a"));
+    assert!(!is_key_path_matched(&identifier_key(&["a"]), "ab"));
+    assert!(!is_key_path_matched(&identifier_key(&["ab"]), "a"));
+    assert!(!is_key_path_matched(&identifier_key(&["a"]), ""));
+    // Dotted identifier keys.
+    assert!(is_key_path_matched(&identifier_key(&["a", "b"]), "a.b"));
+    assert!(!is_key_path_matched(&identifier_key(&["a", "b"]), "a"));
+    assert!(!is_key_path_matched(&identifier_key(&["a", "b"]), "ab"));
+    assert!(!is_key_path_matched(&identifier_key(&["a", "b"]), "a.bc"));
+    assert!(!is_key_path_matched(&identifier_key(&["a", "b"]), "a.b.c"));
+    assert!(!is_key_path_matched(&identifier_key(&["a", "bc"]), "a.b"));
+    assert!(!is_key_path_matched(&identifier_key(&["a", "b"]), "a_b"));
+    // String literal keys.
+    assert!(is_key_path_matched(&string_key("a"), "a"));
+    assert!(is_key_path_matched(&string_key("a.b"), "a.b"));
+    assert!(!is_key_path_matched(&string_key("a.b"), "a"));
+    assert!(!is_key_path_matched(&string_key("a.b"), "a.bc"));
+    assert!(!is_key_path_matched(&string_key("a.bc"), "a.b"));
+    // Entries without keys only match the empty path.
+    assert!(is_key_path_matched(&None, ""));
+    assert!(!is_key_path_matched(&None, "a"));
+}
+
+/// Test override the config entries with identifier, dotted identifier and string literal keys.
+#[test]
+fn test_override_config_key_path() {
+    let code = r#"config = {
+    a = 1
+    ab = 2
+    c = 3
+    cd = 4
+    "e.f" = 5
+    "e.fg" = 6
+    h.i = 7
+    h.ij = 8
+}
+"#;
+    let specs = [
+        "config.a-",
+        "config.cd-",
+        r#"config["e.f"]-"#,
+        r#"config["e.fg"]=60"#,
+        "config.h.i-",
+    ];
+    let mut module = parse_file_force_errors("test.k", Some(code.to_string())).unwrap();
+    for s in specs {
+        apply_override_on_module(&mut module, s, &[]).unwrap();
+    }
+    assert_eq!(
+        print_ast_module(&module),
+        r#"config = {
+    ab = 2
+    c = 3
+    "e.fg" = 60
+    h: {}
+    h: {ij = 8}
+}
+"#
+    );
+}
+
 /// Test override spec parser.
 #[test]
 fn test_parse_override_spec_invalid() {
@@ -206,6 +327,114 @@ fn test_parse_override_spec_invalid() {
     }
 }
 
+/// Test the override operators inside string literals, escapes, unterminated strings
+/// and triple quotes are split the same as the former regex based string skipping.
+#[test]
+fn test_parse_override_spec() {
+    use kclvm_ast::ast::{self, ConfigEntryOperation, OverrideAction};
+    let cases = [
+        (
+            r#""a=b".c=1"#,
+            r#""a=b".c"#,
+            "1",
+            ConfigEntryOperation::Override,
+        ),
+        (
+            r#""a:b".c:1"#,
+            r#""a:b".c"#,
+            "1",
+            ConfigEntryOperation::Union,
+        ),
+        (
+            r#""a+=b".c+=[1]"#,
+            r#""a+=b".c"#,
+            "[1]",
+            ConfigEntryOperation::Insert,
+        ),
+        ("'a=b'.c=1", "'a=b'.c", "1", ConfigEntryOperation::Override),
+        ("'a:b'.c:1", "'a:b'.c", "1", ConfigEntryOperation::Union),
+        (
+            "'a+=b'.c+=[1]",
+            "'a+=b'.c",
+            "[1]",
+            ConfigEntryOperation::Insert,
+        ),
+        (
+            r#"a["b=c"]=1"#,
+            r#"a["b=c"]"#,
+            "1",
+            ConfigEntryOperation::Override,
+        ),
+        // Escaped quotes do not close the string literal.
+        (
+            r#""a\"=b"=1"#,
+            r#""a\"=b""#,
+            "1",
+            ConfigEntryOperation::Override,
+        ),
+        (
+            r#"'a\'=b'=1"#,
+            r#"'a\'=b'"#,
+            "1",
+            ConfigEntryOperation::Override,
+        ),
+        // An escaped backslash before the quote closes the string literal.
+        (
+            r#""a\\"=b"=1"#,
+            r#""a\\""#,
+            r#"b"=1"#,
+            ConfigEntryOperation::Override,
+        ),
+        // An unterminated string literal is not skipped.
+        (r#""a=1"#, r#""a"#, "1", ConfigEntryOperation::Override),
+        ("'a:1", "'a", "1", ConfigEntryOperation::Union),
+        // A string literal can not contain a newline.
+        (
+            "\"a\n=b\"=1",
+            "\"a",
+            "b\"=1",
+            ConfigEntryOperation::Override,
+        ),
+        // Triple quotes are not skipped as a string literal.
+        (
+            r#""""a=b"""=1"#,
+            r#""""a"#,
+            r#"b"""=1"#,
+            ConfigEntryOperation::Override,
+        ),
+        ("'''a:b''':1", "'''a", "b''':1", ConfigEntryOperation::Union),
+    ];
+    for (spec, field_path, field_value, operation) in cases {
+        assert_eq!(
+            parse_override_spec(spec).unwrap(),
+            ast::OverrideSpec {
+                field_path: field_path.to_string(),
+                field_value: field_value.to_string(),
+                action: OverrideAction::CreateOrUpdate,
+                operation,
+            },
+            "{spec} test failed"
+        );
+    }
+    // The delete operator `-` inside string literals.
+    for (spec, field_path) in [
+        (r#""a-b"-"#, r#""a-b""#),
+        ("'a-b'-", "'a-b'"),
+        (r#"a["b-c"]-"#, r#"a["b-c"]"#),
+    ] {
+        assert_eq!(
+            parse_override_spec(spec).unwrap(),
+            ast::OverrideSpec {
+                field_path: field_path.to_string(),
+                field_value: "".to_string(),
+                action: OverrideAction::Delete,
+                operation: ConfigEntryOperation::Override,
+            },
+            "{spec} test failed"
+        );
+    }
+}
+
 #[test]
 fn test_parse_property_path() {
     assert_eq!(parse_attribute_path("a.b.c").unwrap(), vec!["a", "b", "c"]);
@@ -746,6 +975,40 @@ fn test_override_file_with_invalid_spec() {
     assert_eq!(err.to_string(), "Invalid spec format '....', expected <field_path>=filed_value>, <field_path>:filed_value>, <field_path>+=filed_value> or <field_path>-");
 }
 
+/// Test the overrides before an invalid spec are still applied and printed, and the
+/// overrides after it are not applied.
+#[test]
+fn test_apply_overrides_with_invalid_spec() {
+    let specs = vec![
+        "config.image=\"image/image:v2\"".to_string(),
+        "....".to_string(),
+        "config.replicas=2".to_string(),
+    ];
+    let main_path = get_test_dir("test_apply_overrides/main.k".to_string());
+    let main_bk_path = get_test_dir("test_apply_overrides/main.bk.k".to_string());
+    fs::copy(main_bk_path.clone(), main_path.clone()).unwrap();
+
+    let module = parse_file_force_errors(main_path.to_str().unwrap(), None).unwrap();
+    let mut prog = kclvm_ast::ast::Program {
+        root: get_test_dir("test_apply_overrides".to_string())
+            .display()
+            .to_string(),
+        pkgs: HashMap::from([(kclvm_ast::MAIN_PKG.to_string(), vec![module])]),
+    };
+    let result = apply_overrides(&mut prog, &specs, &[], true);
+    assert_eq!(result.err().unwrap().to_string(), "Invalid spec format '....', expected <field_path>=filed_value>, <field_path>:filed_value>, <field_path>+=filed_value> or <field_path>-");
+    assert_eq!(
+        fs::read_to_string(main_path.clone()).unwrap(),
+        r#"config = {
+    image = "image/image:v2"
+    replicas = 1
+}
+"#
+    );
+
+    fs::copy(main_bk_path.clone(), main_path.clone()).unwrap();
+}
+
 #[test]
 fn test_list_merged_variables() {
     let file = PathBuf::from("./src/test_data/test_list_variables/test_list_merged_variables")
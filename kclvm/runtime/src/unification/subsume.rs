@@ -1,5 +1,7 @@
 //! Copyright The KCL Authors. All rights reserved.
 
+use std::rc::Rc;
+
 use crate::*;
 
 /// Calculate the partial order relationship between `KCL value objects`
@@ -10,25 +12,19 @@ use crate::*;
 /// type and value, and there is no partial order relationship between type
 /// objects and value objects.
 pub fn value_subsume(value1: &ValueRef, value2: &ValueRef, should_recursive_check: bool) -> bool {
-    if value1.is_none_or_undefined() || value2.is_none_or_undefined() {
-        return true;
-    }
-    if value1 == value2 {
+    // Compare the references first, so a value is subsumed by itself without a deep
+    // equality check.
+    if Rc::ptr_eq(&value1.rc, &value2.rc) || value1 == value2 {
         return true;
     }
-    if value1.is_int() && value2.is_int() {
-        return value1.as_int() == value2.as_int();
-    }
-    if value1.is_float() && value2.is_float() {
-        return value1.as_float() == value2.as_float();
-    }
-    if value1.is_bool() && value2.is_bool() {
-        return value1.as_bool() == value2.as_bool();
-    }
-    if value1.is_str() && value2.is_str() {
-        return value1.as_str() == value2.as_str();
-    }
+    // Dispatch on the kinds of both values with one match, instead of checking
+    // the kinds one by one with a borrow for each check.
     match (&*value1.rc.borrow(), &*value2.rc.borrow()) {
+        (Value::none | Value::undefined, _) | (_, Value::none | Value::undefined) => true,
+        (Value::int_value(value1), Value::int_value(value2)) => value1 == value2,
+        (Value::float_value(value1), Value::float_value(value2)) => value1 == value2,
+        (Value::bool_value(value1), Value::bool_value(value2)) => value1 == value2,
+        (Value::str_value(value1), Value::str_value(value2)) => value1 == value2,
         (Value::list_value(value1), Value::list_value(value2)) => {
             return value1.values.len() == value2.values.len()
                 && value1
@@ -41,20 +37,16 @@ pub fn value_subsume(value1: &ValueRef, value2: &ValueRef, should_recursive_chec
             Value::dict_value(_) | Value::schema_value(_),
             Value::dict_value(_) | Value::schema_value(_),
         ) => {
-            let value1_dict = &value1.as_dict_ref().values;
-            let value2_dict = &value2.as_dict_ref().values;
-            if value1_dict.is_empty() {
-                return true;
-            }
-            if value1_dict.keys().all(|key| !value2_dict.contains_key(key)) {
+            // Empty or disjoint dicts are always subsumed, and so are all dicts when the
+            // values are not checked recursively.
+            if !should_recursive_check {
                 return true;
             }
-            if should_recursive_check {
-                for (key1, value1) in value1_dict {
-                    if !value2_dict.contains_key(key1) {
-                        continue;
-                    }
-                    let value2 = value2_dict.get(key1).unwrap();
+            let value1_dict = &value1.as_dict_ref().values;
+            let value2_dict = &value2.as_dict_ref().values;
+            // Look up each key once, the keys only in value1 are skipped.
+            for (key1, value1) in value1_dict {
+                if let Some(value2) = value2_dict.get(key1) {
                     if !value_subsume(value1, value2, should_recursive_check) {
                         return false;
                     }
@@ -69,88 +69,87 @@ impl ValueRef {
                 } else {
                     -1
                 };
-                if !obj.values.contains_key(k) {
-                    obj.values.insert(k.clone(), v.clone());
-                } else {
-                    match operation {
-                        ConfigEntryOperationKind::Union => {
-                            let obj_value = obj.values.get_mut(k).unwrap();
-                            if opts.idempotent_check && !value_subsume(v, obj_value, false) {
-                                union_context.conflict = true;
-                                union_context.path_backtrace.push(k.clone());
-                                union_context.obj_json = if obj_value.is_config() {
-                                    "{...}".to_string()
-                                } else if obj_value.is_list() {
-                                    "[...]".to_string()
-                                } else {
-                                    obj_value.to_json_string()
-                                };
+                // Look up the existing value once and update it in place.
+                let obj_value = match obj.values.get_mut(k) {
+                    Some(obj_value) => obj_value,
+                    None => {
+                        obj.values.insert(k.clone(), v.clone());
+                        continue;
+                    }
+                };
+                match operation {
+                    ConfigEntryOperationKind::Union => {
+                        if opts.idempotent_check && !value_subsume(v, obj_value, false) {
+                            union_context.conflict = true;
+                            union_context.path_backtrace.push(k.clone());
+                            union_context.obj_json = if obj_value.is_config() {
+                                "{...}".to_string()
+                            } else if obj_value.is_list() {
+                                "[...]".to_string()
+                            } else {
+                                obj_value.to_json_string()
+                            };
 
-                                union_context.delta_json = if v.is_config() {
-                                    "{...}".to_string()
-                                } else if v.is_list() {
-                                    "[...]".to_string()
-                                } else {
-                                    v.to_json_string()
-                                };
-                                return;
-                            }
-                            obj_value.union(ctx, v, false, opts, union_context);
-                            if union_context.conflict {
-                                union_context.path_backtrace.push(k.clone());
-                                return;
-                            }
-                        }
-                        ConfigEntryOperationKind::Override => {
-                            if index < 0 {
-                                obj.values.insert(k.clone(), v.clone());
+                            union_context.delta_json = if v.is_config() {
+                                "{...}".to_string()
+                            } else if v.is_list() {
+                                "[...]".to_string()
                             } else {
-                                let origin_value = obj.values.get_mut(k).unwrap();
-                                if !origin_value.is_list() {
-                                    panic!("only list attribute can be inserted value");
-                                }
-                                if v.is_none_or_undefined() {
-                                    origin_value.list_remove_at(index as usize);
-                                } else {
-                                    origin_value.list_set(index as usize, v);
-                                }
-                            }
+                                v.to_json_string()
+                            };
+                            return;
                         }
-                        ConfigEntryOperationKind::Insert => {
-                            let origin_value = obj.values.get_mut(k).unwrap();
-                            if origin_value.is_none_or_undefined() {
-                                let list = ValueRef::list(None);
-                                obj.values.insert(k.to_string(), list);
+                        obj_value.union(ctx, v, false, opts, union_context);
+                        if union_context.conflict {
+                            union_context.path_backtrace.push(k.clone());
+                            return;
+                        }
+                    }
+                    ConfigEntryOperationKind::Override => {
+                        if index < 0 {
+                            *obj_value = v.clone();
+                        } else {
+                            if !obj_value.is_list() {
+                                panic!("only list attribute can be inserted value");
                             }
-                            let origin_value = obj.values.get_mut(k).unwrap();
-                            if origin_value.is_same_ref(v) {
-                                continue;
+                            if v.is_none_or_undefined() {
+                                obj_value.list_remove_at(index as usize);
+                            } else {
+                                obj_value.list_set(index as usize, v);
                             }
-                            match (&mut *origin_value.rc.borrow_mut(), &*v.rc.borrow()) {
-                                (Value::list_value(origin_value), Value::list_value(value)) => {
-                                    if index == -1 {
-                                        for elem in value.values.iter() {
-                                            origin_value.values.push(elem.clone());
-                                        }
-                                    } else if index >= 0 {
-                                        let mut insert_index = index;
-                                        for v in &value.values {
-                                            origin_value
-                                                .values
-                                                .insert(insert_index as usize, v.clone());
-                                            insert_index += 1;
-                                        }
-                                    }
-                                }
-                                _ => panic!("only list attribute can be inserted value"),
-                            };
                         }
                     }
+                    ConfigEntryOperationKind::Insert => {
+                        if obj_value.is_none_or_undefined() {
+                            *obj_value = ValueRef::list(None);
+                        }
+                        if obj_value.is_same_ref(v) {
+                            continue;
+                        }
+                        match (&mut *obj_value.rc.borrow_mut(), &*v.rc.borrow()) {
+                            (Value::list_value(origin_value), Value::list_value(value)) => {
+                                if index == -1 {
+                                    origin_value.values.extend(value.values.iter().cloned());
+                                } else if index >= 0 && !value.values.is_empty() {
+                                    // Splice the values in with one shift of the tail,
+                                    // instead of shifting it once for every inserted value.
+                                    // An empty list is skipped, so that inserting nothing
+                                    // past the end of the list is a no-op as before.
+                                    let index = index as usize;
+                                    origin_value
+                                        .values
+                                        .splice(index..index, value.values.iter().cloned());
+                                }
+                            }
+                            _ => panic!("only list attribute can be inserted value"),
+                        };
+                    }
                 }
             }
         };
 
-        //union schema vars
+        // Union schema vars. The common keys are collected from the chained key iterators
+        // with a single allocation, instead of appending a second temporary key list.
         let mut union_schema = false;
         let mut pkgpath: String = "".to_string();
         let mut name: String = "".to_string();
@@ -161,29 +160,20 @@ impl ValueRef {
         match (&mut *self.rc.borrow_mut(), &*x.rc.borrow()) {
             (Value::list_value(obj), Value::list_value(delta)) => {
                 if !opts.list_override {
-                    let length = if obj.values.len() > delta.values.len() {
-                        obj.values.len()
-                    } else {
-                        delta.values.len()
-                    };
+                    // Union the common prefix in place, then append the rest of the delta
+                    // list, without checking both lengths for every index.
                     let obj_len = obj.values.len();
-                    let delta_len = delta.values.len();
-                    for idx in 0..length {
-                        if idx >= obj_len {
-                            obj.values.push(delta.values[idx].clone());
-                        } else if idx < delta_len {
-                            obj.values[idx].union(
-                                ctx,
-                                &delta.values[idx],
-                                false,
-                                opts,
-                                union_context,
-                            );
-                            if union_context.conflict {
-                                union_context.path_backtrace.push(format!("list[{idx}]"));
-                            }
+                    for (idx, (obj_value, delta_value)) in
+                        obj.values.iter_mut().zip(&delta.values).enumerate()
+                    {
+                        obj_value.union(ctx, delta_value, false, opts, union_context);
+                        if union_context.conflict {
+                            union_context.path_backtrace.push(format!("list[{idx}]"));
                         }
                     }
+                    if delta.values.len() > obj_len {
+                        obj.values.extend(delta.values[obj_len..].iter().cloned());
+                    }
                 }
             }
             (Value::dict_value(obj), Value::dict_value(delta)) => union_fn(obj, delta),
@@ -192,9 +182,12 @@ impl ValueRef {
                 pkgpath = obj.pkgpath.clone();
                 let obj_value = obj.config.as_mut();
                 union_fn(obj_value, delta);
-                common_keys = obj.config_keys.clone();
-                let mut other_keys: Vec<String> = delta.values.keys().cloned().collect();
-                common_keys.append(&mut other_keys);
+                common_keys = obj
+                    .config_keys
+                    .iter()
+                    .chain(delta.values.keys())
+                    .cloned()
+                    .collect();
                 args = Some(obj.args.clone());
                 kwargs = Some(obj.kwargs.clone());
                 union_schema = true;
@@ -205,9 +198,12 @@ impl ValueRef {
                 let obj_value = obj.config.as_mut();
                 let delta_value = delta.config.as_ref();
                 union_fn(obj_value, delta_value);
-                common_keys = obj.config_keys.clone();
-                let mut other_keys: Vec<String> = delta.config_keys.clone();
-                common_keys.append(&mut other_keys);
+                common_keys = obj
+                    .config_keys
+                    .iter()
+                    .chain(&delta.config_keys)
+                    .cloned()
+                    .collect();
                 args = Some(delta.args.clone());
                 kwargs = Some(delta.kwargs.clone());
                 union_schema = true;
@@ -217,9 +213,12 @@ impl ValueRef {
                 pkgpath = delta.pkgpath.clone();
                 let delta_value = delta.config.as_ref();
                 union_fn(obj, delta_value);
-                common_keys = delta.config_keys.clone();
-                let mut other_keys: Vec<String> = obj.values.keys().cloned().collect();
-                common_keys.append(&mut other_keys);
+                common_keys = delta
+                    .config_keys
+                    .iter()
+                    .chain(obj.values.keys())
+                    .cloned()
+                    .collect();
                 args = Some(delta.args.clone());
                 kwargs = Some(delta.kwargs.clone());
                 union_schema = true;
@@ -465,6 +464,16 @@ mod test_value_union {
                 vec![("key", vec![2, 3], ConfigEntryOperationKind::Insert, 1)],
                 vec![("key", vec![0, 2, 3, 1], ConfigEntryOperationKind::Insert, 1)],
             ),
+            (
+                vec![("key", vec![0, 1], ConfigEntryOperationKind::Override, -1)],
+                vec![("key", vec![2, 3], ConfigEntryOperationKind::Insert, 2)],
+                vec![("key", vec![0, 1, 2, 3], ConfigEntryOperationKind::Insert, 2)],
+            ),
+            (
+                vec![("key", vec![0, 1], ConfigEntryOperationKind::Override, -1)],
+                vec![("key", vec![], ConfigEntryOperationKind::Insert, 5)],
+                vec![("key", vec![0, 1], ConfigEntryOperationKind::Insert, 5)],
+            ),
         ];
         for (left_entries, right_entries, expected) in cases {
             let mut left_value = ValueRef::dict(None);
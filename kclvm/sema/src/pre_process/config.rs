@@ -27,18 +27,17 @@ impl ConfigNestAttrTransformer {
                 // }
                 // ```
                 if identifier.names.len() > 1 {
-                    let mut names = identifier.names.clone();
-                    let names = &mut names[1..];
-                    names.reverse();
-                    identifier.names = vec![identifier.names[0].clone()];
-                    key.filename = identifier.names[0].filename.clone();
-                    key.line = identifier.names[0].line;
-                    key.column = identifier.names[0].column;
-                    key.end_line = identifier.names[0].end_line;
-                    key.end_column = identifier.names[0].end_column;
+                    // Move the nested names out of the key, leaving only the first name, and
+                    // walk them from the innermost one without cloning and reversing them.
+                    let names = identifier.names.split_off(1);
+                    let first_name_pos = identifier.names[0].pos();
+                    key.set_pos(first_name_pos);
 
                     let mut value = config_entry.node.value.clone();
-                    for (i, name) in names.iter().enumerate() {
+                    // Every nested config node spans the same end as the entry value.
+                    let (value_filename, value_end_line, value_end_column) =
+                        (value.filename.clone(), value.end_line, value.end_column);
+                    for (i, name) in names.iter().rev().enumerate() {
                         let is_last_item = i == 0;
                         let name_node = ast::Identifier {
                             names: vec![name.clone()],
@@ -54,7 +53,9 @@ impl ConfigNestAttrTransformer {
                                 name.end_line,
                                 name.end_column,
                             ))),
-                            value: value.clone(),
+                            // The value is wrapped by this entry, so move it instead of
+                            // cloning the whole nested config at every level.
+                            value,
                             operation: if is_last_item {
                                 config_entry.node.operation.clone()
                             } else {
@@ -74,11 +75,11 @@ impl ConfigNestAttrTransformer {
                         };
                         value = Box::new(ast::Node::new(
                             ast::Expr::Config(config_expr),
-                            value.filename.clone(),
+                            value_filename.clone(),
                             name.line,
                             name.column,
-                            value.end_line,
-                            value.end_column,
+                            value_end_line,
+                            value_end_column,
                         ))
                     }
                     config_entry.node.value = value;
@@ -119,12 +120,11 @@ enum ConfigMergeKind {
 
 impl ConfigMergeTransformer {
     pub fn merge(&mut self, program: &mut ast::Program) {
-        // {name: (filename, module index in main package, statement index in the module body, kind)}
-        // module index is to prevent same filename in main package
-        let mut name_declaration_mapping: IndexMap<
-            String,
-            Vec<(String, usize, usize, ConfigMergeKind)>,
-        > = IndexMap::default();
+        // {name: (module index in main package, statement index in the module body, kind)}
+        // The module index identifies the module even if there are same filenames in the main
+        // package, so the filename is not cloned into every declaration.
+        let mut name_declaration_mapping: IndexMap<String, Vec<(usize, usize, ConfigMergeKind)>> =
+            IndexMap::default();
         // 1. Collect merged config
         if let Some(modules) = program.pkgs.get_mut(kclvm_ast::MAIN_PKG) {
             for (module_id, module) in modules.iter_mut().enumerate() {
@@ -135,21 +135,13 @@ impl ConfigMergeTransformer {
                         {
                             let name = &unification_stmt.target.node.names[0].node;
                             match name_declaration_mapping.get_mut(name) {
-                                Some(declarations) => declarations.push((
-                                    module.filename.to_string(),
-                                    module_id,
-                                    i,
-                                    ConfigMergeKind::Union,
-                                )),
+                                Some(declarations) => {
+                                    declarations.push((module_id, i, ConfigMergeKind::Union))
+                                }
                                 None => {
                                     name_declaration_mapping.insert(
                                         name.to_string(),
-                                        vec![(
-                                            module.filename.to_string(),
-                                            module_id,
-                                            i,
-                                            ConfigMergeKind::Union,
-                                        )],
+                                        vec![(module_id, i, ConfigMergeKind::Union)],
                                     );
                                 }
                             }
@@ -165,7 +157,6 @@ impl ConfigMergeTransformer {
                                                 if is_private_field(name) {
                                                     declarations.clear();
                                                     declarations.push((
-                                                        module.filename.to_string(),
                                                         module_id,
                                                         i,
                                                         ConfigMergeKind::Override,
@@ -175,12 +166,7 @@ impl ConfigMergeTransformer {
                                             None => {
                                                 name_declaration_mapping.insert(
                                                     name.to_string(),
-                                                    vec![(
-                                                        module.filename.to_string(),
-                                                        module_id,
-                                                        i,
-                                                        ConfigMergeKind::Override,
-                                                    )],
+                                                    vec![(module_id, i, ConfigMergeKind::Override)],
                                                 );
                                             }
                                         }
@@ -193,84 +179,71 @@ impl ConfigMergeTransformer {
                 }
             }
         }
+        // Nothing to merge or delete when every name is declared only once.
+        if name_declaration_mapping
+            .values()
+            .all(|declarations| declarations.len() <= 1)
+        {
+            return;
+        }
         // 2. Merge config
         for (_, index_list) in &name_declaration_mapping {
             let index_len = index_list.len();
             if index_len > 1 {
-                let (filename, merged_id, merged_index, merged_kind) = index_list.last().unwrap();
                 let mut items: Vec<ast::NodeRef<ast::ConfigEntry>> = vec![];
-                for (merged_filename, merged_id, index, kind) in index_list {
-                    if let Some(modules) = program.pkgs.get_mut(kclvm_ast::MAIN_PKG) {
-                        for (module_id, module) in modules.iter_mut().enumerate() {
-                            if &module.filename == merged_filename && module_id == *merged_id {
-                                let stmt = module.body.get_mut(*index).unwrap();
-                                match &mut stmt.node {
-                                    ast::Stmt::Unification(unification_stmt)
-                                        if matches!(kind, ConfigMergeKind::Union) =>
-                                    {
-                                        if let ast::Expr::Config(config_expr) =
-                                            &mut unification_stmt.value.node.config.node
-                                        {
-                                            let mut config_items = config_expr.items.clone();
-                                            items.append(&mut config_items);
-                                        }
-                                    }
-                                    ast::Stmt::Assign(assign_stmt)
-                                        if matches!(kind, ConfigMergeKind::Override) =>
-                                    {
-                                        if let ast::Expr::Schema(schema_expr) =
-                                            &mut assign_stmt.value.node
-                                        {
-                                            if let ast::Expr::Config(config_expr) =
-                                                &mut schema_expr.config.node
-                                            {
-                                                let mut config_items = config_expr.items.clone();
-                                                items.append(&mut config_items);
-                                            }
-                                        }
-                                    }
-                                    _ => {
-                                        bug!("mismatch ast node and config merge kind: {:?}", kind)
+                // Collect the items of all the declarations, and the last declaration is
+                // overwritten with the unified items in the same pass.
+                for (n, (merged_id, index, kind)) in index_list.iter().enumerate() {
+                    let is_last = n == index_len - 1;
+                    // The declaration stores its module index, so the module is indexed directly
+                    // instead of scanning all the modules in the main package.
+                    if let Some(module) = program
+                        .pkgs
+                        .get_mut(kclvm_ast::MAIN_PKG)
+                        .and_then(|modules| modules.get_mut(*merged_id))
+                    {
+                        let stmt = module.body.get_mut(*index).unwrap();
+                        match &mut stmt.node {
+                            ast::Stmt::Unification(unification_stmt)
+                                if matches!(kind, ConfigMergeKind::Union) =>
+                            {
+                                if let ast::Expr::Config(config_expr) =
+                                    &mut unification_stmt.value.node.config.node
+                                {
+                                    // The merged statements are deleted or overwritten with
+                                    // the unified items later, so move the items out of them.
+                                    items.append(&mut config_expr.items);
+                                    if is_last {
+                                        config_expr.items =
+                                            unify_config_entries(std::mem::take(&mut items));
                                     }
                                 }
                             }
-                        }
-                    }
-                }
-                if let Some(modules) = program.pkgs.get_mut(kclvm_ast::MAIN_PKG) {
-                    for (module_id, module) in modules.iter_mut().enumerate() {
-                        if &module.filename == filename && module_id == *merged_id {
-                            if let Some(stmt) = module.body.get_mut(*merged_index) {
-                                match &mut stmt.node {
-                                    ast::Stmt::Unification(unification_stmt)
-                                        if matches!(merged_kind, ConfigMergeKind::Union) =>
+                            ast::Stmt::Assign(assign_stmt)
+                                if matches!(kind, ConfigMergeKind::Override) =>
+                            {
+                                if let ast::Expr::Schema(schema_expr) = &mut assign_stmt.value.node
+                                {
+                                    if let ast::Expr::Config(config_expr) =
+                                        &mut schema_expr.config.node
                                     {
-                                        if let ast::Expr::Config(config_expr) =
-                                            &mut unification_stmt.value.node.config.node
-                                        {
-                                            config_expr.items = unify_config_entries(&items);
+                                        // A multi-target assignment is shared by the other
+                                        // target names, so its items are still cloned.
+                                        if assign_stmt.targets.len() == 1 {
+                                            items.append(&mut config_expr.items);
+                                        } else {
+                                            items.extend(config_expr.items.iter().cloned());
                                         }
-                                    }
-                                    ast::Stmt::Assign(assign_stmt)
-                                        if matches!(merged_kind, ConfigMergeKind::Override) =>
-                                    {
-                                        if let ast::Expr::Schema(schema_expr) =
-                                            &mut assign_stmt.value.node
-                                        {
-                                            if let ast::Expr::Config(config_expr) =
-                                                &mut schema_expr.config.node
-                                            {
-                                                config_expr.items = unify_config_entries(&items);
-                                            }
+                                        if is_last {
+                                            config_expr.items =
+                                                unify_config_entries(std::mem::take(&mut items));
                                         }
                                     }
-                                    _ => bug!(
-                                        "mismatch ast node and config merge kind: {:?}",
-                                        merged_kind
-                                    ),
                                 }
                             }
-                            break;
+                            _ => {
+                                bug!("mismatch ast node and config merge kind: {:?}", kind)
+                            }
                         }
                     }
                 }
@@ -278,36 +251,47 @@ impl ConfigMergeTransformer {
         }
         // 3. Delete redundant config.
         if let Some(modules) = program.pkgs.get_mut(kclvm_ast::MAIN_PKG) {
-            for (i, module) in modules.iter_mut().enumerate() {
-                let mut delete_index_set: IndexSet<usize> = IndexSet::default();
-                for (_, index_list) in &name_declaration_mapping {
-                    let index_len = index_list.len();
-                    if index_len > 1 {
-                        for (filename, module_id, index, _) in &index_list[..index_len - 1] {
-                            // Use module filename and index to prevent the same compile filenames
-                            // in the main package.
-                            if &module.filename == filename && i == *module_id {
-                                delete_index_set.insert(*index);
-                            }
+            // Group the statement indices to delete by module in one pass over the declarations,
+            // instead of scanning all the declarations for every module.
+            let mut delete_index_sets: Vec<IndexSet<usize>> =
+                (0..modules.len()).map(|_| IndexSet::default()).collect();
+            for (_, index_list) in &name_declaration_mapping {
+                let index_len = index_list.len();
+                if index_len > 1 {
+                    for (module_id, index, _) in &index_list[..index_len - 1] {
+                        // Use module index to prevent the same compile filenames
+                        // in the main package.
+                        if let Some(delete_index_set) = delete_index_sets.get_mut(*module_id) {
+                            delete_index_set.insert(*index);
                         }
                     }
                 }
-                let mut body: Vec<(usize, &ast::NodeRef<ast::Stmt>)> =
-                    module.body.iter().enumerate().collect();
-                body.retain(|(idx, _)| !delete_index_set.contains(idx));
-                module.body = body
-                    .iter()
-                    .map(|(_, stmt)| (*stmt).clone())
-                    .collect::<Vec<ast::NodeRef<ast::Stmt>>>();
+            }
+            for (module, delete_index_set) in modules.iter_mut().zip(&delete_index_sets) {
+                if delete_index_set.is_empty() {
+                    continue;
+                }
+                // Remove the statements in place, the kept statements are not cloned.
+                let mut idx = 0;
+                module.body.retain(|_| {
+                    let keep = !delete_index_set.contains(&idx);
+                    idx += 1;
+                    keep
+                });
             }
         }
     }
 }
 
-/// Unify config entries.
+/// Unify config entries. The entries are moved into the unified result without being cloned.
 fn unify_config_entries(
-    entries: &[ast::NodeRef<ast::ConfigEntry>],
+    mut entries: Vec<ast::NodeRef<ast::ConfigEntry>>,
 ) -> Vec<ast::NodeRef<ast::ConfigEntry>> {
+    // A single entry has nothing to unify with, so skip the bucket and its key strings.
+    if entries.len() <= 1 {
+        entries.iter_mut().for_each(unify_nested_config_entries);
+        return entries;
+    }
     // Using bucket map to check unique/merge option and store values
     let mut bucket: IndexMap<String, Vec<ast::NodeRef<ast::ConfigEntry>>> = IndexMap::new();
     for entry in entries {
@@ -319,41 +303,41 @@ fn unify_config_entries(
             },
             None => NAME_NONE_BUCKET_KEY.to_string(),
         };
-        let entry = entry.clone();
-        match bucket.get_mut(&name) {
-            Some(values) => {
-                // If the attribute operation is override, clear all previous entries and override
-                // with current entry.
-                if let ast::ConfigEntryOperation::Override = entry.node.operation {
-                    values.clear();
-                }
-                values.push(entry);
-            }
-            None => {
-                let values = vec![entry];
-                bucket.insert(name, values);
-            }
+        // Look up the bucket once with the owned name.
+        let values = bucket.entry(name).or_default();
+        // If the attribute operation is override, clear all previous entries and override
+        // with current entry.
+        if let ast::ConfigEntryOperation::Override = entry.node.operation {
+            values.clear();
         }
+        values.push(entry);
     }
+    // Flatten the bucket and unify the nested config entries in the same pass.
     let mut entries = vec![];
-    for (_, items) in bucket.iter_mut() {
-        entries.append(items);
+    for (_, items) in bucket {
+        for mut entry in items {
+            unify_nested_config_entries(&mut entry);
+            entries.push(entry);
+        }
     }
-    // Unify config entries recursively.
-    for entry in &mut entries {
-        match &mut entry.node.value.node {
-            ast::Expr::Schema(item_schema_expr) => {
-                if let ast::Expr::Config(item_config_expr) = &mut item_schema_expr.config.node {
-                    item_config_expr.items = unify_config_entries(&item_config_expr.items);
-                }
-            }
-            ast::Expr::Config(item_config_expr) => {
-                item_config_expr.items = unify_config_entries(&item_config_expr.items);
+    entries
+}
+
+/// Unify the config entries nested in the config entry value recursively.
+fn unify_nested_config_entries(entry: &mut ast::NodeRef<ast::ConfigEntry>) {
+    match &mut entry.node.value.node {
+        ast::Expr::Schema(item_schema_expr) => {
+            if let ast::Expr::Config(item_config_expr) = &mut item_schema_expr.config.node {
+                item_config_expr.items =
+                    unify_config_entries(std::mem::take(&mut item_config_expr.items));
             }
-            _ => {}
         }
+        ast::Expr::Config(item_config_expr) => {
+            item_config_expr.items =
+                unify_config_entries(std::mem::take(&mut item_config_expr.items));
+        }
+        _ => {}
     }
-    entries
 }
 
 /// Merge program
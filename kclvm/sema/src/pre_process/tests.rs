@@ -125,6 +125,108 @@ fn test_config_merge() {
     }
 }
 
+#[test]
+fn test_config_merge_operation() {
+    fn get_unification_config(stmt: &ast::Stmt) -> &ast::ConfigExpr {
+        if let ast::Stmt::Unification(unification) = stmt {
+            if let ast::Expr::Config(config) = &unification.value.node.config.node {
+                return config;
+            }
+        }
+        panic!(
+            "test failed, expect unification statement with config expression, got {:?}",
+            stmt
+        )
+    }
+    fn get_string_value(expr: &ast::Expr) -> &str {
+        if let ast::Expr::StringLit(string_lit) = expr {
+            &string_lit.value
+        } else {
+            panic!("test failed, expect string literal, got {:?}", expr)
+        }
+    }
+    let sess = Arc::new(ParseSession::default());
+    let mut program = load_program(
+        sess,
+        &["./src/pre_process/test_data/config_merge_operation.k"],
+        None,
+        None,
+    )
+    .unwrap()
+    .program;
+    merge_program(&mut program);
+    let modules = program.pkgs.get_mut(kclvm_ast::MAIN_PKG).unwrap();
+    assert_eq!(modules.len(), 1);
+    // The redundant `person` and `single` declarations are deleted.
+    let module = modules.first().unwrap();
+    assert_eq!(module.body.len(), 3);
+    // person: Person {
+    //     name = "Bob"
+    //     labels: {app: "app"}
+    //     labels: {env: "dev"}
+    //     tags: ["tag0"]
+    //     tags += ["tag1"]
+    //     tags += ["tag2"]
+    //     ports = [8080]
+    // }
+    let config = get_unification_config(&module.body[1].node);
+    assert_eq!(
+        get_attr_paths_from_config_expr(config),
+        vec![
+            "name".to_string(),
+            "labels".to_string(),
+            "labels.app".to_string(),
+            "labels".to_string(),
+            "labels.env".to_string(),
+            "tags".to_string(),
+            "tags".to_string(),
+            "tags".to_string(),
+            "ports".to_string(),
+        ]
+    );
+    assert_eq!(
+        config
+            .items
+            .iter()
+            .map(|item| item.node.operation.clone())
+            .collect::<Vec<ast::ConfigEntryOperation>>(),
+        vec![
+            ast::ConfigEntryOperation::Override,
+            ast::ConfigEntryOperation::Union,
+            ast::ConfigEntryOperation::Union,
+            ast::ConfigEntryOperation::Union,
+            ast::ConfigEntryOperation::Insert,
+            ast::ConfigEntryOperation::Insert,
+            ast::ConfigEntryOperation::Override,
+        ]
+    );
+    assert_eq!(get_string_value(&config.items[0].node.value.node), "Bob");
+    // The single merged entry is not bucketed, but its nested entries are still unified.
+    // single: Person {
+    //     labels: {
+    //         app = "app2"
+    //         env: "dev"
+    //     }
+    // }
+    let config = get_unification_config(&module.body[2].node);
+    assert_eq!(
+        get_attr_paths_from_config_expr(config),
+        vec![
+            "labels".to_string(),
+            "labels.app".to_string(),
+            "labels.env".to_string(),
+        ]
+    );
+    if let ast::Expr::Config(labels) = &config.items[0].node.value.node {
+        assert_eq!(get_string_value(&labels.items[0].node.value.node), "app2");
+    } else {
+        panic!(
+            "test failed, expect config expression, got {:?}",
+            config.items[0].node.value
+        )
+    }
+}
+
 #[test]
 fn test_config_override() {
     let sess = Arc::new(ParseSession::default());
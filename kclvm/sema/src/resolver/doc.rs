@@ -61,9 +61,12 @@ fn clean_doc(doc: &str) -> String {
         while !lines.is_empty() && lines.last().unwrap().trim().is_empty() {
             lines.pop();
         }
-        while !lines.is_empty() && lines[0].trim().is_empty() {
-            lines.remove(0);
-        }
+        // Drain the leading blank lines at once instead of shifting the lines for each one.
+        let leading_blank_count = lines
+            .iter()
+            .take_while(|line| line.trim().is_empty())
+            .count();
+        lines.drain(..leading_blank_count);
     }
     lines.join("\n")
 }
@@ -574,21 +574,15 @@ impl<'ctx> Resolver<'ctx> {
                 .unwrap_or_default(),
         );
         for stmt in &schema_stmt.body {
-            let (name, ty, is_optional, default, decorators, range) = match &stmt.node {
+            let (name, ty, is_optional, decorators, range) = match &stmt.node {
                 ast::Stmt::Unification(unification_stmt) => {
                     let name = unification_stmt.value.node.name.node.get_name();
                     let ty = self.parse_ty_str_with_scope(&name, stmt.get_span_pos());
                     let is_optional = false;
-                    let default = if self.options.resolve_val {
-                        print_schema_expr(&unification_stmt.value.node)
-                    } else {
-                        "".to_string()
-                    };
                     (
                         unification_stmt.target.node.get_name(),
                         ty,
                         is_optional,
-                        Some(default),
                         vec![],
                         stmt.get_span_pos(),
                     )
@@ -598,27 +592,13 @@ impl<'ctx> Resolver<'ctx> {
                     let ty = self
                         .parse_ty_with_scope(Some(&schema_attr.ty), schema_attr.ty.get_span_pos());
                     let is_optional = schema_attr.is_optional;
-                    let default = schema_attr.value.as_ref().map(|v| {
-                        if self.options.resolve_val {
-                            print_ast_node(ASTNode::Expr(v))
-                        } else {
-                            "".to_string()
-                        }
-                    });
                     // Schema attribute decorators
                     let decorators = self.resolve_decorators(
                         &schema_attr.decorators,
                         DecoratorTarget::Attribute,
                         &name,
                     );
-                    (
-                        name,
-                        ty,
-                        is_optional,
-                        default,
-                        decorators,
-                        stmt.get_span_pos(),
-                    )
+                    (name, ty, is_optional, decorators, stmt.get_span_pos())
                 }
                 _ => continue,
             };
@@ -635,6 +615,9 @@ impl<'ctx> Resolver<'ctx> {
                         None
                     }
                 });
+                // Print the default value only when the attribute is recorded, redeclared
+                // attributes never need their (possibly large) default expression formatted.
+                let default = self.schema_attr_default_str(&stmt.node);
                 attr_obj_map.insert(
                     name.clone(),
                     SchemaAttr {
@@ -818,6 +801,26 @@ impl<'ctx> Resolver<'ctx> {
         schema_ty
     }
 
+    /// Get the default value string of the schema attribute statement, the value is
+    /// an empty string when `resolve_val` is not set.
+    fn schema_attr_default_str(&self, stmt: &ast::Stmt) -> Option<String> {
+        match stmt {
+            ast::Stmt::Unification(unification_stmt) => Some(if self.options.resolve_val {
+                print_schema_expr(&unification_stmt.value.node)
+            } else {
+                "".to_string()
+            }),
+            ast::Stmt::SchemaAttr(schema_attr) => schema_attr.value.as_ref().map(|v| {
+                if self.options.resolve_val {
+                    print_ast_node(ASTNode::Expr(v))
+                } else {
+                    "".to_string()
+                }
+            }),
+            _ => None,
+        }
+    }
+
     pub(crate) fn build_rule_type(
         &mut self,
         rule_stmt: &'ctx ast::RuleStmt,
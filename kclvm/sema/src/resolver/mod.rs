@@ -19,7 +19,7 @@ mod var;
 #[cfg(test)]
 mod tests;
 
-use indexmap::IndexMap;
+use indexmap::{IndexMap, IndexSet};
 use kclvm_error::diagnostic::Range;
 use std::sync::Arc;
 use std::{cell::RefCell, rc::Rc};
@@ -120,8 +120,8 @@ pub struct Context {
     pub schema: Option<Rc<RefCell<SchemaType>>>,
     /// Global schemas name and type mapping.
     pub schema_mapping: IndexMap<String, Arc<RefCell<SchemaType>>>,
-    /// For loop local vars.
-    pub local_vars: Vec<String>,
+    /// For loop local vars, kept in a set for the membership checks on every identifier.
+    pub local_vars: IndexSet<String>,
     /// Import pkgpath and name
     pub import_names: IndexMap<String, IndexMap<String, String>>,
     /// Global names at top level of the program.
@@ -354,7 +354,7 @@ impl<'ctx> MutSelfTypedResultWalker<'ctx> for Resolver<'ctx> {
                 );
                 break;
             }
-            self.ctx.local_vars.push(name.node.to_string());
+            self.ctx.local_vars.insert(name.node.to_string());
             let (start, end) = target.get_span_pos();
             self.insert_object(
                 &name.node,
@@ -908,7 +908,7 @@ impl<'ctx> MutSelfTypedResultWalker<'ctx> for Resolver<'ctx> {
                 );
                 break;
             }
-            self.ctx.local_vars.push(name.node.to_string());
+            self.ctx.local_vars.insert(name.node.to_string());
             let (start, end) = target.get_span_pos();
             self.insert_object(
                 &name.node,
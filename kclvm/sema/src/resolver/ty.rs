@@ -450,7 +450,7 @@ impl<'ctx> Resolver<'ctx> {
                 }
                 let mut pkgpath = "".to_string();
                 let name = names[0];
-                if names.len() > 1 && !self.ctx.local_vars.contains(&name.to_string()) {
+                if names.len() > 1 && !self.ctx.local_vars.contains(name) {
                     if let Some(mapping) = self.ctx.import_names.get(&self.ctx.filename) {
                         pkgpath = mapping
                             .get(name)
@@ -293,25 +293,31 @@ impl SchemaType {
         }
     }
 
+    /// Get the schema parameter list string e.g., `[name: str, age: int]`.
+    fn schema_params_str(&self) -> String {
+        if self.func.params.is_empty() {
+            return "".to_string();
+        }
+        let mut params = String::from("[");
+        for (i, p) in self.func.params.iter().enumerate() {
+            if i > 0 {
+                params.push_str(", ");
+            }
+            params.push_str(&p.name);
+            params.push_str(": ");
+            params.push_str(&p.ty.ty_str());
+        }
+        params.push(']');
+        params
+    }
+
     pub fn schema_ty_signature_str(&self) -> (String, String) {
         let base: String = if let Some(base) = &self.base {
             format!("({})", base.name)
         } else {
             "".to_string()
         };
-        let params: String = if self.func.params.is_empty() {
-            "".to_string()
-        } else {
-            format!(
-                "[{}]",
-                self.func
-                    .params
-                    .iter()
-                    .map(|p| format!("{}: {}", p.name.clone(), p.ty.ty_str()))
-                    .collect::<Vec<String>>()
-                    .join(", ")
-            )
-        };
+        let params = self.schema_params_str();
 
         let rest_sign = format!("schema {}{}{}:", self.name, params, base);
 
@@ -324,25 +330,13 @@ impl SchemaType {
         } else {
             "".to_string()
         };
-        let params: String = if self.func.params.is_empty() {
-            "".to_string()
-        } else {
-            format!(
-                "[{}]",
-                self.func
-                    .params
-                    .iter()
-                    .map(|p| format!("{}: {}", p.name.clone(), p.ty.ty_str()))
-                    .collect::<Vec<String>>()
-                    .join(", ")
-            )
-        };
+        let params = self.schema_params_str();
         let params_str = if !params.is_empty() && !base.is_empty() {
             format!("\\{}{}", params, base)
         } else if !params.is_empty() {
-            format!("{}", params)
+            params
         } else if !base.is_empty() {
-            format!("{}", base)
+            base
         } else {
             "".to_string()
         };
@@ -1,6 +1,7 @@
 use std::{collections::HashSet, sync::Arc};
 
 use indexmap::IndexMap;
+use kclvm_ast::MAIN_PKG;
 
 use super::{SchemaType, Type, TypeKind, TypeRef};
 
@@ -9,22 +10,25 @@ use super::{SchemaType, Type, TypeKind, TypeRef};
 /// For security and performance considerations, dynamic dispatch of
 /// types is not supported at this stage.
 pub fn subsume(ty_lhs: TypeRef, ty_rhs: TypeRef, check_left_any: bool) -> bool {
-    if (check_left_any && ty_lhs.is_any()) || (ty_rhs.is_any() || ty_lhs.is_none()) {
+    // A type always subsumes itself, so shared type references need no structural check.
+    if Arc::ptr_eq(&ty_lhs, &ty_rhs) {
         true
-    } else if ty_lhs.is_union() {
-        let types = ty_lhs.union_types();
+    } else if (check_left_any && ty_lhs.is_any()) || (ty_rhs.is_any() || ty_lhs.is_none()) {
+        true
+    } else if let TypeKind::Union(types) = &ty_lhs.kind {
+        // Iterate the union types in place without cloning the type list.
         types
             .iter()
             .all(|ty| subsume(ty.clone(), ty_rhs.clone(), false))
-    } else if ty_rhs.is_union() {
-        let types = ty_rhs.union_types();
+    } else if let TypeKind::Union(types) = &ty_rhs.kind {
         types
             .iter()
             .any(|ty| subsume(ty_lhs.clone(), ty.clone(), false))
     } else if ty_lhs.is_schema() {
-        match &ty_rhs.kind {
-            TypeKind::Schema(ty_rhs_schema) => {
-                is_sub_schema_of(&ty_lhs.into_schema_type(), ty_rhs_schema)
+        // Borrow both schema types instead of cloning the left one with all its attributes.
+        match (&ty_lhs.kind, &ty_rhs.kind) {
+            (TypeKind::Schema(ty_lhs_schema), TypeKind::Schema(ty_rhs_schema)) => {
+                is_sub_schema_of(ty_lhs_schema, ty_rhs_schema)
             }
             _ => false,
         }
@@ -68,27 +72,27 @@ pub fn subsume(ty_lhs: TypeRef, ty_rhs: TypeRef, check_left_any: bool) -> bool {
             && subsume(ty_lhs_val, ty_rhs_val, check_left_any)
     } else if ty_lhs.is_str() && ty_rhs.is_literal() && ty_rhs.is_str() {
         return true;
-    } else if ty_lhs.is_func() && ty_rhs.is_func() {
-        let ty_lhs_fn_ty = ty_lhs.into_func_type();
-        let ty_rhs_fn_ty = ty_rhs.into_func_type();
-        let mut is_ok = ty_lhs_fn_ty.params.len() == ty_rhs_fn_ty.params.len();
-        for (ty_lhs_param, ty_rhs_param) in
-            ty_lhs_fn_ty.params.iter().zip(ty_rhs_fn_ty.params.iter())
-        {
-            is_ok = is_ok
-                && (subsume(
-                    ty_rhs_param.ty.clone(),
-                    ty_lhs_param.ty.clone(),
-                    check_left_any,
-                ));
-        }
-        is_ok = is_ok
-            && (subsume(
+    } else if let (TypeKind::Function(ty_lhs_fn_ty), TypeKind::Function(ty_rhs_fn_ty)) =
+        (&ty_lhs.kind, &ty_rhs.kind)
+    {
+        // Borrow the function types and stop at the first parameter mismatch.
+        ty_lhs_fn_ty.params.len() == ty_rhs_fn_ty.params.len()
+            && ty_lhs_fn_ty
+                .params
+                .iter()
+                .zip(ty_rhs_fn_ty.params.iter())
+                .all(|(ty_lhs_param, ty_rhs_param)| {
+                    subsume(
+                        ty_rhs_param.ty.clone(),
+                        ty_lhs_param.ty.clone(),
+                        check_left_any,
+                    )
+                })
+            && subsume(
                 ty_lhs_fn_ty.return_ty.clone(),
                 ty_rhs_fn_ty.return_ty.clone(),
                 check_left_any,
-            ));
-        is_ok
+            )
     } else {
         equal(ty_lhs, ty_rhs)
     }
@@ -102,7 +106,7 @@ pub fn equal(ty_lhs: TypeRef, ty_rhs: TypeRef) -> bool {
 
 /// Whether the schema is sub schema of another schema.
 pub fn is_sub_schema_of(schema_ty_lhs: &SchemaType, schema_ty_rhs: &SchemaType) -> bool {
-    if schema_ty_lhs.ty_str_with_pkgpath() == schema_ty_rhs.ty_str_with_pkgpath() {
+    if has_same_ty_str_with_pkgpath(schema_ty_lhs, schema_ty_rhs) {
         true
     } else {
         match &schema_ty_lhs.base {
@@ -112,6 +116,20 @@ pub fn is_sub_schema_of(schema_ty_lhs: &SchemaType, schema_ty_rhs: &SchemaType)
     }
 }
 
+/// Whether the two schema types have the same type string with pkgpath. It has the
+/// same result as comparing `ty_str_with_pkgpath`, but does not format the strings.
+fn has_same_ty_str_with_pkgpath(schema_ty_lhs: &SchemaType, schema_ty_rhs: &SchemaType) -> bool {
+    let is_main_pkg = |ty: &SchemaType| ty.pkgpath.is_empty() || ty.pkgpath == MAIN_PKG;
+    match (is_main_pkg(schema_ty_lhs), is_main_pkg(schema_ty_rhs)) {
+        (true, true) => schema_ty_lhs.name == schema_ty_rhs.name,
+        (false, false) => {
+            schema_ty_lhs.pkgpath == schema_ty_rhs.pkgpath
+                && schema_ty_lhs.name == schema_ty_rhs.name
+        }
+        _ => false,
+    }
+}
+
 /// The type can be assigned to the expected type.
 #[inline]
 pub fn assignable_to(ty: TypeRef, expected_ty: TypeRef) -> bool {
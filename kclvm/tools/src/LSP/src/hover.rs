@@ -44,7 +44,11 @@ pub(crate) fn hover(kcl_pos: &KCLPos, gs: &GlobalState) -> Option<lsp_types::Hov
                         // Use the api provided by GlobalState to get all attrs
                         let module_info = gs.get_packages().get_module_info(&kcl_pos.filename);
                         let schema_attrs = obj.get_all_attributes(gs.get_symbols(), module_info);
-                        let mut attrs: Vec<String> = vec![];
+                        // Build the merged doc in place instead of formatting every attribute
+                        // line into a temporary string and joining them afterwards.
+                        let mut merged_doc = rest_sign;
+                        merged_doc.push('\n');
+                        let mut is_first_attr = true;
                         for schema_attr in schema_attrs {
                             if let kclvm_sema::core::symbol::SymbolKind::Attribute =
                                 schema_attr.get_kind()
@@ -57,16 +61,19 @@ pub(crate) fn hover(kcl_pos: &KCLPos, gs: &GlobalState) -> Option<lsp_types::Hov
                                     Some(ty) => ty_hover_content(ty),
                                     None => ANY_TYPE_STR.to_string(),
                                 };
-                                attrs.push(format!(
-                                    "    {}{}: {}",
-                                    name,
-                                    if attr_symbol.is_optional() { "?" } else { "" },
-                                    attr_ty_str,
-                                ));
+                                if !is_first_attr {
+                                    merged_doc.push('\n');
+                                }
+                                is_first_attr = false;
+                                merged_doc.push_str("    ");
+                                merged_doc.push_str(&name);
+                                if attr_symbol.is_optional() {
+                                    merged_doc.push('?');
+                                }
+                                merged_doc.push_str(": ");
+                                merged_doc.push_str(&attr_ty_str);
                             }
                         }
-
-                        let merged_doc = format!("{}\n{}", rest_sign.clone(), attrs.join("\n"));
                         docs.push((merged_doc, MarkedStringType::LanguageString));
 
                         if !schema_ty.doc.is_empty() {
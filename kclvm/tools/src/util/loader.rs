@@ -132,9 +132,11 @@ impl Loader<located_yaml::Yaml> for DataLoader {
             }
         };
 
+        // Move the first document out of the loader instead of cloning the whole tree.
         v.docs
-            .get(0)
-            .map_or_else(|| bail!("Failed to Load YAML"), |res| Ok(res.clone()))
+            .into_iter()
+            .next()
+            .map_or_else(|| bail!("Failed to Load YAML"), Ok)
     }
 }
 
@@ -7,7 +7,6 @@ use kclvm_ast::{
     },
     node_ref,
 };
-use serde_json::json;
 
 use crate::util::loader::{DataLoader, Loader, LoaderKind};
 use anyhow::{bail, Context, Result};
@@ -23,22 +22,26 @@ trait ExprGenerator<T> {
 /// You should set `schema_name` for `Schema Expr` before using `ExprBuilder`.
 pub(crate) struct ExprBuilder {
     loader: DataLoader,
+    // The file name of the loader, looked up once instead of for every YAML node.
+    file_name: String,
 }
 
 impl ExprBuilder {
     pub(crate) fn new_with_file_path(kind: LoaderKind, file_path: String) -> Result<Self> {
         let loader = DataLoader::new_with_file_path(kind, &file_path)
             .with_context(|| format!("Failed to Load '{}'", file_path))?;
+        let file_name = loader.file_name();
 
-        Ok(Self { loader })
+        Ok(Self { loader, file_name })
     }
 
     #[allow(dead_code)]
     pub(crate) fn new_with_str(kind: LoaderKind, content: String) -> Result<Self> {
         let loader = DataLoader::new_with_str(kind, &content)
             .with_context(|| format!("Failed to Parse String '{}'", content))?;
+        let file_name = loader.file_name();
 
-        Ok(Self { loader })
+        Ok(Self { loader, file_name })
     }
 
     /// Generate ast expr from Json/Yaml depends on `LoaderKind`.
@@ -125,7 +128,7 @@ impl ExprGenerator<serde_yaml::Value> for ExprBuilder {
                 Ok(node_ref!(Expr::StringLit(str_lit)))
             }
             serde_yaml::Value::Sequence(j_arr) => {
-                let mut j_arr_ast_nodes: Vec<NodeRef<Expr>> = Vec::new();
+                let mut j_arr_ast_nodes: Vec<NodeRef<Expr>> = Vec::with_capacity(j_arr.len());
                 for j_arr_item in j_arr {
                     j_arr_ast_nodes.push(
                         self.generate(j_arr_item, schema_name)
@@ -138,7 +141,7 @@ impl ExprGenerator<serde_yaml::Value> for ExprBuilder {
                 })))
             }
             serde_yaml::Value::Mapping(j_map) => {
-                let mut config_entries: Vec<NodeRef<ConfigEntry>> = Vec::new();
+                let mut config_entries: Vec<NodeRef<ConfigEntry>> = Vec::with_capacity(j_map.len());
 
                 for (k, v) in j_map.iter() {
                     // The configuration builder already in the schema no longer needs a schema name
@@ -196,7 +199,7 @@ impl ExprGenerator<located_yaml::Yaml> for ExprBuilder {
         schema_name: &Option<String>,
     ) -> Result<NodeRef<Expr>> {
         let loc = (
-            self.loader.file_name(),
+            self.file_name.clone(),
             value.marker.line as u64,
             value.marker.col as u64,
             0,
@@ -222,19 +225,14 @@ impl ExprGenerator<located_yaml::Yaml> for ExprBuilder {
                     loc
                 ))
             }
-            located_yaml::YamlElt::Integer(j_int) => {
-                if json!(j_int).is_i64() {
-                    Ok(node_ref!(
-                        Expr::NumberLit(NumberLit {
-                            binary_suffix: None,
-                            value: NumberLitValue::Int(*j_int)
-                        }),
-                        loc
-                    ))
-                } else {
-                    bail!("{FAIL_LOAD_VALIDATED_ERR_MSG}, Unsupported Number Type");
-                }
-            }
+            // The YAML integer is already an i64, so it always fits a KCL int.
+            located_yaml::YamlElt::Integer(j_int) => Ok(node_ref!(
+                Expr::NumberLit(NumberLit {
+                    binary_suffix: None,
+                    value: NumberLitValue::Int(*j_int)
+                }),
+                loc
+            )),
             located_yaml::YamlElt::Real(j_float) => {
                 if let Ok(number_lit) = j_float.parse::<f64>() {
                     if format!("{}", number_lit) != *j_float {
@@ -261,7 +259,7 @@ impl ExprGenerator<located_yaml::Yaml> for ExprBuilder {
                 Ok(node_ref!(Expr::StringLit(str_lit), loc))
             }
             located_yaml::YamlElt::Array(j_arr) => {
-                let mut j_arr_ast_nodes: Vec<NodeRef<Expr>> = Vec::new();
+                let mut j_arr_ast_nodes: Vec<NodeRef<Expr>> = Vec::with_capacity(j_arr.len());
                 for j_arr_item in j_arr {
                     j_arr_ast_nodes.push(
                         self.generate(j_arr_item, schema_name)
@@ -277,7 +275,7 @@ impl ExprGenerator<located_yaml::Yaml> for ExprBuilder {
                 ))
             }
             located_yaml::YamlElt::Hash(j_map) => {
-                let mut config_entries: Vec<NodeRef<ConfigEntry>> = Vec::new();
+                let mut config_entries: Vec<NodeRef<ConfigEntry>> = Vec::with_capacity(j_map.len());
 
                 for (k, v) in j_map.iter() {
                     // The configuration builder already in the schema no longer needs a schema name
@@ -421,7 +419,7 @@ impl ExprGenerator<json_spanned_value::Spanned<json_spanned_value::Value>> for E
                 Ok(node_ref!(Expr::StringLit(str_lit), loc))
             }
             json_spanned_value::Value::Array(j_arr) => {
-                let mut j_arr_ast_nodes: Vec<NodeRef<Expr>> = Vec::new();
+                let mut j_arr_ast_nodes: Vec<NodeRef<Expr>> = Vec::with_capacity(j_arr.len());
                 for j_arr_item in j_arr {
                     j_arr_ast_nodes.push(
                         self.generate(j_arr_item, schema_name)
@@ -437,7 +435,7 @@ impl ExprGenerator<json_spanned_value::Spanned<json_spanned_value::Value>> for E
                 ))
             }
             json_spanned_value::Value::Object(j_map) => {
-                let mut config_entries: Vec<NodeRef<ConfigEntry>> = Vec::new();
+                let mut config_entries: Vec<NodeRef<ConfigEntry>> = Vec::with_capacity(j_map.len());
 
                 for (k, v) in j_map.iter() {
                     let k_span = k.span();
@@ -572,7 +570,7 @@ impl ExprGenerator<serde_json::Value> for ExprBuilder {
                 Ok(node_ref!(Expr::StringLit(str_lit)))
             }
             serde_json::Value::Array(j_arr) => {
-                let mut j_arr_ast_nodes: Vec<NodeRef<Expr>> = Vec::new();
+                let mut j_arr_ast_nodes: Vec<NodeRef<Expr>> = Vec::with_capacity(j_arr.len());
                 for j_arr_item in j_arr {
                     j_arr_ast_nodes.push(
                         self.generate(j_arr_item, schema_name)
@@ -585,7 +583,7 @@ impl ExprGenerator<serde_json::Value> for ExprBuilder {
                 })))
             }
             serde_json::Value::Object(j_map) => {
-                let mut config_entries: Vec<NodeRef<ConfigEntry>> = Vec::new();
+                let mut config_entries: Vec<NodeRef<ConfigEntry>> = Vec::with_capacity(j_map.len());
 
                 for (k, v) in j_map.iter() {
                     let k = match StringLit::try_from(k.to_string()) {
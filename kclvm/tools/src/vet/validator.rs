@@ -193,10 +193,12 @@ pub fn validate(val_opt: ValidateOption) -> Result<bool> {
         None,
     )?;
 
-    let schemas = filter_schema_stmt_from_prog(&compile_res.program);
+    // The schema statements are only collected when no schema name is given.
     let schema_name = match val_opt.schema_name {
         Some(name) => Some(name),
-        None => schemas.get(0).map(|schema| schema.name.node.clone()),
+        None => filter_schema_stmt_from_prog(&compile_res.program)
+            .first()
+            .map(|schema| schema.name.node.clone()),
     };
 
     let expr_builder =
@@ -242,10 +244,7 @@ fn build_assign(attr_name: &str, node: NodeRef<Expr>) -> NodeRef<Stmt> {
 
 fn filter_schema_stmt_from_prog(prog: &Program) -> Vec<&SchemaStmt> {
     let mut result = vec![];
-    for (pkg_name, modules) in &prog.pkgs {
-        if pkg_name != kclvm_ast::MAIN_PKG {
-            continue;
-        }
+    if let Some(modules) = prog.pkgs.get(kclvm_ast::MAIN_PKG) {
         for module in modules {
             for stmt in &module.body {
                 if let Stmt::Schema(s) = &stmt.node {